@@ -0,0 +1,102 @@
+"""Нагрузочное сравнение запущенных серверов, например WSGI и ASGI.
+
+Серверы поднимаются отдельно из каталога blogicum/, например:
+
+    gunicorn blogicum.wsgi -w 1 --threads 8 -b 127.0.0.1:8001
+    BLOG_ASYNC_VIEWS=1 uvicorn blogicum.asgi:application --port 8002
+
+Затем из корня репозитория:
+
+    python bench/load_test.py http://127.0.0.1:8001 http://127.0.0.1:8002
+        --path / --path /posts/1/ --concurrency 32 --requests 2000
+
+Для каждого сервера печатается JSON с пропускной способностью и
+перцентилями задержки.
+"""
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))
+    return ordered[index]
+
+
+class Worker(threading.local):
+    def connection(self, netloc):
+        if getattr(self, 'conn', None) is None:
+            self.conn = http.client.HTTPConnection(netloc, timeout=30)
+        return self.conn
+
+    def reset(self):
+        if getattr(self, 'conn', None) is not None:
+            self.conn.close()
+        self.conn = None
+
+
+def run(base_url, paths, concurrency, total):
+    netloc = urlsplit(base_url).netloc
+    worker = Worker()
+
+    def fetch(index):
+        path = paths[index % len(paths)]
+        started = time.perf_counter()
+        try:
+            conn = worker.connection(netloc)
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            worker.reset()
+            status = None
+        return status, (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(fetch, range(total)))
+    elapsed = time.perf_counter() - started
+    latencies = [latency for status, latency in results if status == 200]
+    return {
+        'url': base_url,
+        'concurrency': concurrency,
+        'requests': total,
+        'ok': len(latencies),
+        'errors': total - len(latencies),
+        'req_per_sec': round(total / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies), 2)
+        if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99), 2)
+        if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('urls', nargs='+')
+    parser.add_argument('--path', action='append', dest='paths')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--warmup', type=int, default=100)
+    args = parser.parse_args()
+    paths = args.paths or ['/']
+
+    for url in args.urls:
+        run(url, paths, args.concurrency, args.warmup)
+        print(json.dumps(
+            run(url, paths, args.concurrency, args.requests),
+            ensure_ascii=False,
+        ))
+
+
+if __name__ == '__main__':
+    main()
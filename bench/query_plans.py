@@ -0,0 +1,126 @@
+"""Планы и время запросов ленты до и после индексов из 0006_feed_indexes.
+
+Запуск из корня репозитория:
+
+    python bench/query_plans.py --posts 1000000
+
+База создаётся во временном файле SQLite и удаляется после замера.
+Схема мигрируется до конца, а индексы из 0006 удаляются и создаются
+заново вручную: откат миграций убрал бы и более поздние столбцы, которые
+нужны модели.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from importlib import import_module
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+BATCH_SIZE = 10000
+REPEAT = 20
+
+
+def seed(n_posts, n_authors=1000, n_categories=50):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from blog.models import Category, Post
+
+    User = get_user_model()
+    User.objects.bulk_create(
+        User(username=f'user{i}') for i in range(n_authors)
+    )
+    Category.objects.bulk_create(
+        Category(title=f'Категория {i}', slug=f'category-{i}',
+                 is_published=i % 10 != 0)
+        for i in range(n_categories)
+    )
+    author_ids = list(User.objects.values_list('id', flat=True))
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    now = timezone.now()
+    for start in range(0, n_posts, BATCH_SIZE):
+        Post.objects.bulk_create(
+            Post(
+                title=f'Пост {i}',
+                text='Текст',
+                pub_date=now - timedelta(minutes=i - n_posts // 100),
+                author_id=author_ids[i % len(author_ids)],
+                category_id=category_ids[i % len(category_ids)],
+                is_published=i % 20 != 0,
+            )
+            for i in range(start, min(start + BATCH_SIZE, n_posts))
+        )
+
+
+def feed_querysets():
+    from django.contrib.auth import get_user_model
+
+    from blog.models import Category, Post
+
+    category = Category.objects.filter(is_published=True).first()
+    author = get_user_model().objects.first()
+    return {
+        'index': Post.objects.published().with_related(),
+        'category': category.posts.published().with_related(),
+        'profile': author.posts.with_related(),
+    }
+
+
+def report(title):
+    print(f'=== {title}')
+    for name, queryset in feed_querysets().items():
+        page = queryset[5000:5010]
+        started = time.perf_counter()
+        for _ in range(REPEAT):
+            list(page)
+        elapsed = (time.perf_counter() - started) / REPEAT * 1000
+        print(f'--- {name}: {elapsed:.2f} ms')
+        print(page.explain())
+
+
+def feed_indexes():
+    """Пары (модель, индекс) из миграции 0006_feed_indexes."""
+    from django.apps import apps
+
+    migration = import_module('blog.migrations.0006_feed_indexes').Migration
+    return [
+        (apps.get_model('blog', operation.model_name), operation.index)
+        for operation in migration.operations
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        settings.DATABASES['default']['NAME'] = Path(tmp_dir) / 'bench.db'
+        django.setup()
+        from django.core.management import call_command
+        from django.db import connection
+
+        call_command('migrate', verbosity=0)
+        with connection.schema_editor() as schema_editor:
+            for model, index in feed_indexes():
+                schema_editor.remove_index(model, index)
+        seed(args.posts)
+        report('без индексов')
+        started = time.perf_counter()
+        with connection.schema_editor() as schema_editor:
+            for model, index in feed_indexes():
+                schema_editor.add_index(model, index)
+        print(f'Построение индексов: {time.perf_counter() - started:.1f} s')
+        report('с индексами')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""Смешанная нагрузка чтения и записи на SQLite до и после PRAGMA-настроек.
+
+Запуск из корня репозитория:
+
+    python bench/sqlite_concurrency.py --readers 8 --writers 2 --seconds 10
+
+Каждый режим выполняется в отдельном процессе на своей временной базе:
+`default` — настройки из blogicum.settings, `tuned` — SQLITE_PRAGMAS и
+CONN_MAX_AGE из blogicum.settings_production.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+N_POSTS = 2000
+
+
+def setup_django(mode, db_path):
+    sys.path.insert(0, str(ROOT / 'blogicum'))
+    os.environ['DJANGO_SETTINGS_MODULE'] = (
+        'blogicum.settings_production' if mode == 'tuned'
+        else 'blogicum.settings'
+    )
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = db_path
+    settings.WARM_TEMPLATES_ON_STARTUP = False
+    django.setup()
+
+
+def seed():
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from blog.models import Category, Post, User
+
+    call_command('migrate', verbosity=0)
+    author = User.objects.create(username='author')
+    category = Category.objects.create(title='Категория', slug='category')
+    Post.objects.bulk_create(
+        Post(title=f'Пост {i}', text='Текст', pub_date=timezone.now(),
+             author=author, category=category)
+        for i in range(N_POSTS)
+    )
+    return author
+
+
+class Counters:
+    def __init__(self):
+        self.values = {'reads': 0, 'writes': 0, 'errors': 0}
+        self.lock = threading.Lock()
+
+    def add(self, name):
+        with self.lock:
+            self.values[name] += 1
+
+
+def read_loop(stop, counters, post_ids):
+    from django.db import connection, OperationalError
+
+    from blog.models import Comment, Post
+
+    index = 0
+    while not stop.is_set():
+        try:
+            list(Post.objects.published().with_related()[:10])
+            list(Comment.objects.filter(
+                post_id=post_ids[index % len(post_ids)]
+            ).select_related('author')[:50])
+            counters.add('reads')
+        except OperationalError:
+            counters.add('errors')
+        index += 1
+    connection.close()
+
+
+def write_loop(stop, counters, post_ids, author):
+    from django.db import connection, OperationalError, transaction
+
+    from blog.models import Comment
+
+    index = 0
+    while not stop.is_set():
+        try:
+            with transaction.atomic():
+                Comment.objects.create(
+                    post_id=post_ids[index % len(post_ids)],
+                    author=author,
+                    text='Комментарий',
+                )
+            counters.add('writes')
+        except OperationalError:
+            counters.add('errors')
+        index += 1
+    connection.close()
+
+
+def measure(mode, db_path, readers, writers, seconds):
+    setup_django(mode, db_path)
+    from blog.models import Post
+
+    author = seed()
+    post_ids = list(Post.objects.values_list('id', flat=True))
+    stop = threading.Event()
+    counters = Counters()
+    threads = [
+        threading.Thread(target=read_loop, args=(stop, counters, post_ids))
+        for _ in range(readers)
+    ] + [
+        threading.Thread(
+            target=write_loop, args=(stop, counters, post_ids, author)
+        )
+        for _ in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {
+        'mode': mode,
+        'readers': readers,
+        'writers': writers,
+        'reads_per_sec': round(counters.values['reads'] / seconds, 1),
+        'writes_per_sec': round(counters.values['writes'] / seconds, 1),
+        'errors': counters.values['errors'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--mode', choices=('default', 'tuned'))
+    parser.add_argument('--db')
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(
+            args.mode, args.db, args.readers, args.writers, args.seconds
+        ), ensure_ascii=False))
+        return
+
+    for mode in ('default', 'tuned'):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            subprocess.run([
+                sys.executable, __file__, '--mode', mode,
+                '--db', str(Path(tmp_dir) / 'bench.db'),
+                '--readers', str(args.readers),
+                '--writers', str(args.writers),
+                '--seconds', str(args.seconds),
+            ], check=True)
+
+
+if __name__ == '__main__':
+    main()
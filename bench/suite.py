@@ -0,0 +1,183 @@
+"""Замер основных страниц блога в процессе через тестовый клиент Django.
+
+Запуск из корня репозитория:
+
+    python bench/suite.py --posts 10000 --comments 50000 --output run.json
+
+Без --db база создаётся во временном файле SQLite и заполняется командой
+generate_data с заданным зерном, поэтому прогоны с одинаковыми
+параметрами сравнимы между собой. С --db используется готовая база.
+Для замера с боевыми настройками:
+
+    DJANGO_SETTINGS_MODULE=blogicum.settings_production python bench/suite.py
+
+Каждая страница запрашивается анонимом (работает кэш страниц) и
+авторизованным пользователем (страница строится заново). Результат —
+JSON с req/s, p50/p95/p99 в миллисекундах и числом SQL-запросов.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from load_test import percentile
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+SCALE_OPTIONS = ('users', 'categories', 'locations', 'posts', 'comments')
+
+
+def pick_urls():
+    from django.db.models import Count
+
+    from blog.models import Category, Post, User
+
+    posts = Post.objects.published()
+    popular = posts.order_by('-comment_count').first()
+    typical = posts.order_by('comment_count')[posts.count() // 2]
+    category = Category.objects.filter(is_published=True).annotate(
+        total=Count('posts')).order_by('-total').first()
+    author = User.objects.annotate(
+        total=Count('posts')).order_by('-total').first()
+    word = typical.title.split()[0]
+    return {
+        'index': '/',
+        'index_deep_page': '/?page=50',
+        'category': f'/category/{category.slug}/',
+        'profile': f'/profile/{author.username}/',
+        'post_detail_popular': f'/posts/{popular.id}/',
+        'post_detail_typical': f'/posts/{typical.id}/',
+        'comments_page': f'/posts/{popular.id}/comments/',
+        'search': f'/search/?q={word}',
+        'api_posts': '/api/posts/',
+    }
+
+
+def measure(client, url, n_requests, warmup):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    for _ in range(warmup):
+        client.get(url)
+    # CaptureQueriesContext читает журнал запросов соединения лениво,
+    # а следующие запросы клиента его очищают: число берётся сразу.
+    with CaptureQueriesContext(connection) as queries:
+        status = client.get(url).status_code
+    query_count = len(queries)
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(n_requests):
+        request_started = time.perf_counter()
+        client.get(url)
+        latencies.append((time.perf_counter() - request_started) * 1000)
+    elapsed = time.perf_counter() - started
+    return {
+        'status': status,
+        'requests': n_requests,
+        'req_per_sec': round(n_requests / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies), 2),
+        'p95_ms': round(percentile(latencies, 0.95), 2),
+        'p99_ms': round(percentile(latencies, 0.99), 2),
+        'queries': query_count,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+            text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def dataset_size():
+    from blog.models import Category, Comment, Location, Post, User
+
+    return {
+        model._meta.model_name: model.objects.count()
+        for model in (User, Category, Location, Post, Comment)
+    }
+
+
+def run(args):
+    from django.core.management import call_command
+    from django.test import Client
+
+    from blog.models import User
+
+    call_command('migrate', verbosity=0)
+    if args.db is None:
+        call_command(
+            'generate_data', seed=args.seed, verbosity=0,
+            stdout=open(os.devnull, 'w'),
+            **{name: getattr(args, name) for name in SCALE_OPTIONS},
+        )
+    user_client = Client()
+    user_client.force_login(User.objects.order_by('id').first())
+    clients = {'anonymous': Client(), 'user': user_client}
+    results = []
+    for name, url in pick_urls().items():
+        for client_name, client in clients.items():
+            results.append({
+                'name': name, 'client': client_name, 'url': url,
+                **measure(client, url, args.requests, args.warmup),
+            })
+            print(json.dumps(results[-1], ensure_ascii=False),
+                  file=sys.stderr)
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'settings': os.environ['DJANGO_SETTINGS_MODULE'],
+            'database': settings.DATABASES['default']['ENGINE'],
+            'seed': args.seed,
+            'dataset': dataset_size(),
+        },
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help='Готовая база SQLite вместо новой.')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--categories', type=int, default=20)
+    parser.add_argument('--locations', type=int, default=100)
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--comments', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--output', help='Файл для JSON; иначе stdout.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        settings.DATABASES['default']['NAME'] = (
+            args.db or Path(tmp_dir) / 'bench.db')
+        settings.ALLOWED_HOSTS = ['testserver']
+        settings.DEBUG = False
+        django.setup()
+        report = json.dumps(run(args), ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(report + '\n', encoding='utf-8')
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Задержка запросов с фоновыми задачами и без них (TASKS_EAGER).
+
+Запуск из корня репозитория:
+
+    python bench/task_queue.py --repeat 20 --posts 20000
+
+Замеряются редактирование публикации с загрузкой изображения (создание
+уменьшенных копий) и сохранение категории (обновление версий карточек её
+публикаций). База и медиафайлы создаются во временном каталоге.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+IMAGE_SIZE = (3000, 2000)
+BATCH_SIZE = 5000
+
+
+def seed(n_posts):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from blog.models import Category, Post
+
+    author = get_user_model().objects.create_user('author', password='pass')
+    category = Category.objects.create(title='Категория', slug='category')
+    now = timezone.now()
+    for start in range(0, n_posts, BATCH_SIZE):
+        Post.objects.bulk_create(
+            Post(title=f'Пост {i}', text='Текст', pub_date=now,
+                 author=author, category=category)
+            for i in range(start, min(start + BATCH_SIZE, n_posts))
+        )
+    return author, category, Post.objects.first()
+
+
+def make_image():
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from PIL import Image
+
+    data = BytesIO()
+    Image.effect_noise(IMAGE_SIZE, 64).convert('RGB').save(data, 'JPEG')
+    return SimpleUploadedFile('bench.jpg', data.getvalue(),
+                              content_type='image/jpeg')
+
+
+def summary(timings):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return f'медиана {statistics.median(timings):.1f} ms, p95 {p95:.1f} ms'
+
+
+def measure(client, category, post, repeat):
+    uploads, saves = [], []
+    for _ in range(repeat):
+        data = {
+            'title': post.title,
+            'text': post.text,
+            'pub_date': post.pub_date.strftime('%Y-%m-%dT%H:%M'),
+            'category': category.id,
+            'image': make_image(),
+        }
+        started = time.perf_counter()
+        client.post(f'/posts/{post.id}/edit/', data=data)
+        uploads.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        category.save()
+        saves.append((time.perf_counter() - started) * 1000)
+    print(f'  редактирование с изображением: {summary(uploads)}')
+    print(f'  сохранение категории: {summary(saves)}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--posts', type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        settings.DATABASES['default']['NAME'] = Path(tmp_dir) / 'bench.db'
+        settings.MEDIA_ROOT = Path(tmp_dir) / 'media'
+        settings.ALLOWED_HOSTS = ['testserver']
+        django.setup()
+        from django.core.management import call_command
+        from django.test import Client
+
+        from taskqueue.queue import run_pending
+
+        call_command('migrate', verbosity=0)
+        author, category, post = seed(args.posts)
+        client = Client()
+        client.force_login(author)
+
+        for eager in (True, False):
+            settings.TASKS_EAGER = eager
+            print('В запросе:' if eager else 'Через очередь:')
+            measure(client, category, post, args.repeat)
+        started = time.perf_counter()
+        processed = run_pending()
+        elapsed = time.perf_counter() - started
+        print(f'Воркер выполнил {processed} задач за {elapsed:.1f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Время рендеринга blog/index.html с обычными и кэширующими загрузчиками.
+
+Запуск из корня репозитория:
+
+    python bench/template_render.py --repeat 500
+
+Публикации создаются в памяти, база данных не нужна; кэш фрагментов
+отключается, чтобы замерять именно работу шаблонов.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import AnonymousUser  # noqa: E402
+from django.core.paginator import Paginator  # noqa: E402
+from django.template.loader import render_to_string  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from blog.models import Category, Location, Post, User  # noqa: E402
+from blog.utils import POSTS_PER_PAGE, warm_templates  # noqa: E402
+from blogicum import settings_production  # noqa: E402
+
+NO_CACHE = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+def make_context():
+    category = Category(id=1, title='Категория', slug='category')
+    location = Location(id=1, name='Место')
+    author = User(id=1, username='author')
+    posts = [
+        Post(
+            id=i, title=f'Пост {i}', text='Текст публикации ' * 50,
+            pub_date=timezone.now(), author=author, category=category,
+            location=location,
+        )
+        for i in range(1, POSTS_PER_PAGE * 3 + 1)
+    ]
+    page_obj = Paginator(posts, POSTS_PER_PAGE).get_page(2)
+    return {'page_obj': page_obj, 'post_list': page_obj.object_list}
+
+
+def measure(repeat):
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    context = make_context()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render_to_string('blog/index.html', context, request=request)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    with override_settings(CACHES=NO_CACHE):
+        median, worst = measure(args.repeat)
+        print(f'Загрузчики по умолчанию: медиана {median:.2f} мс, '
+              f'максимум {worst:.2f} мс')
+        with override_settings(TEMPLATES=settings_production.TEMPLATES):
+            warm_templates()
+            median, worst = measure(args.repeat)
+        print(f'Кэширующий загрузчик: медиана {median:.2f} мс, '
+              f'максимум {worst:.2f} мс')
+
+
+if __name__ == '__main__':
+    main()
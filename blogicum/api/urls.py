@@ -0,0 +1,16 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/', views.post_list, name='posts'),
+    path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path('posts/<int:post_id>/comments/', views.comment_list,
+         name='comments'),
+    path('categories/', views.category_list, name='categories'),
+    path('locations/', views.location_list, name='locations'),
+    path('export/<str:table>/', views.export, name='export'),
+    path('metrics/', views.metrics, name='metrics'),
+]
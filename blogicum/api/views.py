@@ -0,0 +1,230 @@
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db.models import CharField, Case, F, Value, When
+from django.db.models.functions import Concat
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_safe
+
+from blog.caching import cache_anonymous_page, FEED_SCOPE, POST_SCOPE
+from blog.exports import EXPORT_FORMATS, export_chunks, EXPORTS
+from blog.metrics import get_stats
+from blog.models import Category, Comment, Location, Post
+from blog.paginators import CursorPaginator
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_IDS = 100
+
+POST_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'category': 'category__slug',
+    'location': Case(
+        When(location__is_published=True, then=F('location__name'))
+    ),
+    'image': Case(
+        When(image__gt='', then=Concat(Value(settings.MEDIA_URL), 'image')),
+        output_field=CharField(),
+    ),
+    'comment_count': 'comment_count',
+}
+POST_DEFAULT_FIELDS = (
+    'id', 'title', 'pub_date', 'author', 'category', 'location',
+    'comment_count',
+)
+COMMENT_FIELDS = {
+    'id': 'id',
+    'post': 'post_id',
+    'author': 'author__username',
+    'text': 'text',
+    'created_at': 'created_at',
+}
+CATEGORY_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'slug': 'slug',
+    'description': 'description',
+}
+LOCATION_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+}
+EXPORT_CONTENT_TYPES = {
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class BadRequest(Exception):
+    pass
+
+
+def error_response(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+def get_field_names(request, fields, default):
+    requested = request.GET.get('fields')
+    if not requested:
+        return list(default)
+    names = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = [name for name in names if name not in fields]
+    if unknown:
+        raise BadRequest(f'Неизвестные поля: {", ".join(unknown)}')
+    return names
+
+
+def get_ids(request):
+    try:
+        ids = [int(value) for value in request.GET['ids'].split(',')]
+    except ValueError:
+        raise BadRequest('Параметр ids должен быть списком чисел.')
+    if len(ids) > MAX_IDS:
+        raise BadRequest(f'Можно запросить не больше {MAX_IDS} объектов.')
+    return ids
+
+
+def get_page_size(request):
+    try:
+        size = int(request.GET.get('limit', PAGE_SIZE))
+    except ValueError:
+        raise BadRequest('Параметр limit должен быть числом.')
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def select_values(queryset, fields, names, extra=()):
+    """Выбирает нужные поля через `.values()` под псевдонимами API.
+
+    Поля из `extra` (например, ключи курсора) выбираются в любом случае
+    и удаляются из ответа функцией `rename_rows`, если их не запрашивали.
+    """
+    lookups = []
+    expressions = {}
+    for name in dict.fromkeys([*names, *extra]):
+        source = fields.get(name, name)
+        if isinstance(source, str):
+            lookups.append(source)
+        else:
+            expressions[f'api_{name}'] = source
+    return queryset.values(*lookups, **expressions)
+
+
+def rename_rows(rows, fields, names):
+    columns = [
+        (name, source if isinstance(source, str) else f'api_{name}')
+        for name, source in ((name, fields[name]) for name in names)
+    ]
+    return [{name: row[column] for name, column in columns} for row in rows]
+
+
+def list_response(request, queryset, fields, default, ordering):
+    names = get_field_names(request, fields, default)
+    if 'ids' in request.GET:
+        rows = select_values(queryset.filter(id__in=get_ids(request)),
+                             fields, names)
+        return JsonResponse({
+            'results': rename_rows(rows, fields, names), 'next': None,
+        })
+    order_fields = [name.lstrip('-') for name in ordering]
+    paginator = CursorPaginator(
+        select_values(queryset, fields, names, extra=order_fields),
+        get_page_size(request),
+        ordering=ordering,
+    )
+    page = paginator.get_page(request.GET.get('cursor'))
+    return JsonResponse({
+        'results': rename_rows(page, fields, names),
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    })
+
+
+def api_view(view):
+    @require_safe
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except BadRequest as error:
+            return error_response(str(error))
+    return wrapper
+
+
+@cache_anonymous_page(schedule={}, scope=FEED_SCOPE)
+@api_view
+def post_list(request):
+    posts = Post.objects.published()
+    if 'category' in request.GET:
+        posts = posts.filter(category__slug=request.GET['category'])
+    if 'author' in request.GET:
+        posts = posts.filter(author__username=request.GET['author'])
+    return list_response(
+        request, posts, POST_FIELDS, POST_DEFAULT_FIELDS,
+        ordering=('-pub_date', '-id'),
+    )
+
+
+@cache_anonymous_page(scope=POST_SCOPE)
+@api_view
+def post_detail(request, post_id):
+    names = get_field_names(request, POST_FIELDS, POST_FIELDS)
+    row = get_object_or_404(
+        select_values(Post.objects.published(), POST_FIELDS, names),
+        id=post_id,
+    )
+    return JsonResponse(rename_rows([row], POST_FIELDS, names)[0])
+
+
+@cache_anonymous_page(scope=POST_SCOPE)
+@api_view
+def comment_list(request, post_id):
+    post = get_object_or_404(Post.objects.published(), id=post_id)
+    return list_response(
+        request, Comment.objects.filter(post=post),
+        COMMENT_FIELDS, COMMENT_FIELDS, ordering=('created_at', 'id'),
+    )
+
+
+@cache_anonymous_page()
+@api_view
+def category_list(request):
+    return list_response(
+        request, Category.objects.filter(is_published=True),
+        CATEGORY_FIELDS, CATEGORY_FIELDS, ordering=('id',),
+    )
+
+
+@cache_anonymous_page()
+@api_view
+def location_list(request):
+    return list_response(
+        request, Location.objects.filter(is_published=True),
+        LOCATION_FIELDS, LOCATION_FIELDS, ordering=('id',),
+    )
+
+
+@require_safe
+@staff_member_required
+def export(request, table):
+    export_format = request.GET.get('format', 'jsonl')
+    if table not in EXPORTS or export_format not in EXPORT_FORMATS:
+        raise Http404('Неизвестная таблица или формат выгрузки.')
+    response = StreamingHttpResponse(
+        export_chunks(table, export_format),
+        content_type=EXPORT_CONTENT_TYPES[export_format],
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{table}.{export_format}"')
+    return response
+
+
+@require_safe
+@staff_member_required
+def metrics(request):
+    return JsonResponse(get_stats())
@@ -1,16 +1,57 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.db.models.functions import Substr
 from django.template.defaultfilters import truncatechars
 
 from .models import Category, Location, Post
+from .paginators import EstimatedCountPaginator
+
+TRUNC_TEXT_LENGTH = 30
 
 
 def trunc_text(self):
-    return truncatechars(self.text, 30)
+    return truncatechars(self.short_text, TRUNC_TEXT_LENGTH)
 
 
 trunc_text.short_description = 'Текст'
 
 
+class AuthorUsernameFilter(admin.SimpleListFilter):
+    title = 'автору'
+    parameter_name = 'author_username'
+    template = 'admin/blog/author_filter.html'
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(author__username=self.value())
+        return queryset
+
+    def choices(self, changelist):
+        yield {
+            'value': self.value() or '',
+            'hidden_params': [
+                (name, value) for name, value in changelist.params.items()
+                if name != self.parameter_name
+            ],
+            'clear_query_string': changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+        }
+
+
+class PostChangeList(ChangeList):
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('text').annotate(
+            short_text=Substr('text', 1, TRUNC_TEXT_LENGTH + 1)
+        )
+
+
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
     list_display = (
@@ -26,11 +67,29 @@ class PostAdmin(admin.ModelAdmin):
         'is_published',
     )
     search_fields = ('title',)
-    list_filter = ('author', 'is_published',)
+    list_filter = (AuthorUsernameFilter, 'is_published',)
     list_display_links = ('title',)
+    list_select_related = ('author', 'category')
+    autocomplete_fields = ('author', 'location')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     list_per_page = 10
 
+    def get_changelist(self, request, **kwargs):
+        return PostChangeList
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_foreignkey(
+            db_field, request, **kwargs
+        )
+        if db_field.name == 'category' and request is not None:
+            choices = getattr(request, '_category_choices', None)
+            if choices is None:
+                choices = request._category_choices = list(formfield.choices)
+            formfield.choices = choices
+        return formfield
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -38,9 +97,11 @@ class CategoryAdmin(admin.ModelAdmin):
     list_editable = (
         'is_published',
     )
+    search_fields = ('title',)
 
 
 @admin.register(Location)
 class LocationAdmin(admin.ModelAdmin):
     list_display = ('name', 'is_published',)
     list_editable = ('is_published',)
+    search_fields = ('name',)
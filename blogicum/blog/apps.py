@@ -5,3 +5,12 @@ class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from django.conf import settings
+
+        from blog import signals  # noqa: F401
+        from blog.utils import warm_templates
+
+        if settings.WARM_TEMPLATES_ON_STARTUP:
+            warm_templates()
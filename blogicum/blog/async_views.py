@@ -0,0 +1,57 @@
+from asgiref.sync import sync_to_async
+from django.shortcuts import render
+
+from blog.caching import (
+    cache_anonymous_page, AUTHOR_SCOPE, CATEGORY_SCOPE, FEED_SCOPE, POST_SCOPE
+)
+from blog.views import (
+    get_category_context,
+    get_index_context,
+    get_post_detail_context,
+    get_profile_context,
+)
+
+
+def load_context(get_context, request, **kwargs):
+    """Выполняет все запросы к базе до рендеринга вне event loop.
+
+    Шаблоны не должны обращаться к ORM из асинхронного контекста,
+    поэтому пользователь и страница публикаций загружаются здесь.
+    """
+    request.user.is_authenticated
+    context = get_context(request, **kwargs)
+    page_obj = context.get("page_obj")
+    if page_obj is not None:
+        page_obj.object_list = list(page_obj.object_list)
+    return context
+
+
+@cache_anonymous_page(schedule={}, scope=FEED_SCOPE)
+async def index_view(request):
+    context = await sync_to_async(load_context)(get_index_context, request)
+    return render(request, "blog/index.html", context)
+
+
+@cache_anonymous_page(scope=POST_SCOPE)
+async def post_detail_view(request, post_id):
+    context = await sync_to_async(load_context)(
+        get_post_detail_context, request, post_id=post_id
+    )
+    return render(request, "blog/detail.html", context)
+
+
+@cache_anonymous_page(schedule={'category_slug': 'category__slug'},
+                      scope=CATEGORY_SCOPE)
+async def category_posts_view(request, category_slug):
+    context = await sync_to_async(load_context)(
+        get_category_context, request, category_slug=category_slug
+    )
+    return render(request, "blog/category.html", context)
+
+
+@cache_anonymous_page(scope=AUTHOR_SCOPE)
+async def user_profile_view(request, username):
+    context = await sync_to_async(load_context)(
+        get_profile_context, request, username=username
+    )
+    return render(request, "blog/profile.html", context)
@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+from functools import wraps
+from math import ceil
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+POSTS_VERSION_KEY = 'blog:posts_version'
+# Версия всех страниц сразу: меняется при правке категорий,
+# местоположений и пользователей и после массовой загрузки данных.
+PAGES_VERSION_KEY = 'blog:pages_version'
+CACHEABLE_METHODS = ('GET', 'HEAD')
+
+# Области страниц со своей версией; поля подставляются из аргументов URL.
+FEED_SCOPE = 'feed'
+POST_SCOPE = 'post:{post_id}'
+CATEGORY_SCOPE = 'category:{category_slug}'
+AUTHOR_SCOPE = 'author:{username}'
+
+
+def get_cache_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_cache_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def page_version_key(scope):
+    return f'{PAGES_VERSION_KEY}:{scope}'
+
+
+def bump_page_versions(*scopes):
+    """Сбрасывает кэш страниц заданных областей, например `post:1`."""
+    for scope in set(scopes):
+        bump_cache_version(page_version_key(scope))
+
+
+def get_next_pub_date(**lookups):
+    """Ближайшая отложенная публикация в ленте, заданной фильтром `lookups`.
+
+    Результат хранится в кэше до смены версии публикаций или до
+    наступления найденной даты.
+    """
+    from blog.models import Post
+
+    scope = hashlib.md5(repr(sorted(lookups.items())).encode()).hexdigest()
+    key = (
+        f'blog:next_pub_date:{get_cache_version(POSTS_VERSION_KEY)}:{scope}'
+    )
+    next_pub_date = cache.get(key)
+    now = timezone.now()
+    if next_pub_date is None or (next_pub_date and next_pub_date <= now):
+        next_pub_date = Post.objects.filter(
+            is_published=True,
+            pub_date__gt=now,
+            category__is_published=True,
+            **lookups,
+        ).order_by('pub_date').values_list('pub_date', flat=True).first()
+        cache.set(key, next_pub_date or '', None)
+    return next_pub_date or None
+
+
+def limit_timeout_by_schedule(timeout, schedule):
+    """Не даёт кэшу ленты пережить выход её ближайшей отложенной публикации.
+
+    `schedule` — фильтр публикаций ленты; None означает, что содержимое
+    не зависит от времени.
+    """
+    if schedule is None:
+        return timeout
+    next_pub_date = get_next_pub_date(**schedule)
+    if next_pub_date is None:
+        return timeout
+    seconds_left = (next_pub_date - timezone.now()).total_seconds()
+    return max(1, min(timeout, ceil(seconds_left)))
+
+
+def get_cached_page(request, scope=None):
+    """Возвращает ключ кэша и сохранённый ответ для анонимного запроса.
+
+    В ключ входят общая версия страниц и версия области `scope`.
+    """
+    if (request.method not in CACHEABLE_METHODS
+            or request.user.is_authenticated):
+        return None, None
+    path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    version = get_cache_version(PAGES_VERSION_KEY)
+    if scope is not None:
+        version = f'{version}.{get_cache_version(page_version_key(scope))}'
+    key = f'blog:page:{version}:{request.method}:{path_hash}'
+    return key, cache.get(key)
+
+
+def cache_page_response(key, response, schedule, view_kwargs):
+    if response.status_code != 200 or response.streaming:
+        return
+    timeout = limit_timeout_by_schedule(
+        settings.PAGE_CACHE_TIMEOUT,
+        None if schedule is None else {
+            lookup: view_kwargs[name] for name, lookup in schedule.items()
+        },
+    )
+    if getattr(response, 'is_rendered', True):
+        cache.set(key, response, timeout)
+    else:
+        response.add_post_render_callback(
+            lambda rendered: cache.set(key, rendered, timeout)
+        )
+
+
+def format_scope(scope, view_kwargs):
+    return None if scope is None else scope.format(**view_kwargs)
+
+
+def cache_anonymous_page(schedule=None, scope=None):
+    """Кэширует страницы для анонимных пользователей.
+
+    `schedule` сопоставляет аргументы URL с фильтрами публикаций ленты,
+    например `{'category_slug': 'category__slug'}`; пустой словарь —
+    общая лента, None — страница не зависит от отложенных публикаций.
+    `scope` — шаблон области страницы из аргументов URL, например
+    POST_SCOPE: кэш сбрасывается при смене версии этой области или
+    общей версии страниц. Без `scope` — только общей.
+    """
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                key, response = await sync_to_async(get_cached_page)(
+                    request, format_scope(scope, kwargs))
+                if response is not None:
+                    return response
+                response = await view(request, *args, **kwargs)
+                if key is not None:
+                    await sync_to_async(cache_page_response)(
+                        key, response, schedule, kwargs
+                    )
+                return response
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key, response = get_cached_page(
+                request, format_scope(scope, kwargs))
+            if response is not None:
+                return response
+            response = view(request, *args, **kwargs)
+            if key is not None:
+                cache_page_response(key, response, schedule, kwargs)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,139 @@
+"""Материализованные ленты категорий.
+
+В таблице `CategoryFeedEntry` по строке на каждую видимую сейчас
+публикацию, поэтому страница категории — один проход по индексу
+(category, pub_date, post) без проверки публикации, категории и даты.
+
+Таблица обновляется сигналами при сохранении публикаций и категорий.
+Отложенная публикация попадает в ленту задачей, поставленной в очередь
+на её дату, а при отставшем воркере — командой `sync_category_feeds`,
+которая запускается по расписанию и пересобирает таблицу после массовой
+загрузки. При TASKS_EAGER отложенных задач нет, поэтому страница
+категории сама проверяет, не наступила ли дата ближайшей отложенной
+публикации. Проверка читает основную базу, а при чтении с реплик не
+выполняется: запись в запросе, который обслуживают реплики, недопустима.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from blog.caching import (
+    AUTHOR_SCOPE, bump_cache_version, bump_page_versions, CATEGORY_SCOPE,
+    FEED_SCOPE, get_cache_version, POSTS_VERSION_KEY
+)
+from blog.models import CategoryFeedEntry, Post
+
+BATCH_SIZE = 2000
+
+# Поля публикации, от которых зависит её место в ленте.
+FEED_FIELDS = frozenset(('is_published', 'pub_date', 'category'))
+
+
+def is_visible(post):
+    return (
+        post.is_published
+        and post.pub_date <= timezone.now()
+        and post.category is not None
+        and post.category.is_published
+    )
+
+
+def sync_post(post):
+    """Добавляет публикацию в ленту её категории или убирает из неё."""
+    from blog.tasks import promote_scheduled_posts
+
+    if not is_visible(post):
+        CategoryFeedEntry.objects.filter(post=post).delete()
+        if (not settings.TASKS_EAGER and post.is_published
+                and post.pub_date > timezone.now()):
+            promote_scheduled_posts.delay_until(post.pub_date)
+        return
+    CategoryFeedEntry.objects.update_or_create(post=post, defaults={
+        'category_id': post.category_id,
+        'pub_date': post.pub_date,
+    })
+
+
+def create_entries(posts):
+    """Добавляет в ленты публикации из выборки; возвращает их количество.
+
+    Выборка читается пачками по первичному ключу, а не одним курсором:
+    в SQLite чтение открытым курсором таблицы, в которую тут же идёт
+    запись, не гарантирует согласованного результата.
+    """
+    created = 0
+    last_pk = 0
+    while True:
+        batch = [
+            CategoryFeedEntry(post_id=pk, category_id=category_id,
+                              pub_date=pub_date)
+            for pk, category_id, pub_date in posts.filter(
+                pk__gt=last_pk).order_by('pk').values_list(
+                    'pk', 'category_id', 'pub_date')[:BATCH_SIZE]
+        ]
+        if not batch:
+            return created
+        CategoryFeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        created += len(batch)
+        last_pk = batch[-1].post_id
+
+
+def sync_category(category):
+    """Заполняет или очищает ленту после смены статуса категории."""
+    if not category.is_published:
+        CategoryFeedEntry.objects.filter(category=category).delete()
+        return
+    create_entries(Post.objects.published().filter(
+        category=category, feed_entry__isnull=True))
+
+
+@transaction.atomic
+def promote_due_posts():
+    """Добавляет в ленты наступившие отложенные публикации.
+
+    Возвращает число добавленных публикаций; если оно ненулевое,
+    сбрасывает кэш счётчиков и страниц ленты, затронутых категорий и
+    авторов.
+    """
+    due = Post.objects.using('default').published().filter(
+        feed_entry__isnull=True)
+    scopes = {
+        scope
+        for slug, username in due.values_list(
+            'category__slug', 'author__username')
+        for scope in (CATEGORY_SCOPE.format(category_slug=slug),
+                      AUTHOR_SCOPE.format(username=username))
+    }
+    promoted = create_entries(due)
+    if promoted:
+        bump_cache_version(POSTS_VERSION_KEY)
+        bump_page_versions(FEED_SCOPE, *scopes)
+    return promoted
+
+
+def promote_if_due():
+    """Добавляет в ленты отложенные публикации, если их время наступило.
+
+    Дата ближайшей публикации вне лент хранится в кэше до смены версии
+    публикаций, поэтому обычно проверка не обращается к базе. Вызывается
+    только при TASKS_EAGER вне чтения с реплик.
+    """
+    key = f'blog:feed_next_due:{get_cache_version(POSTS_VERSION_KEY)}'
+    next_due = cache.get(key)
+    if next_due is None:
+        next_due = Post.objects.using('default').filter(
+            is_published=True,
+            category__is_published=True,
+            feed_entry__isnull=True,
+        ).order_by('pub_date').values_list('pub_date', flat=True).first()
+        cache.set(key, next_due or '', None)
+    if next_due and next_due <= timezone.now():
+        promote_due_posts()
+
+
+@transaction.atomic
+def rebuild_category_feeds():
+    """Собирает ленты заново; возвращает число строк в них."""
+    CategoryFeedEntry.objects.all().delete()
+    return create_entries(Post.objects.published())
@@ -0,0 +1,165 @@
+import json
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import connection, reset_queries
+
+CHUNK_SIZE = 64 * 1024
+
+# Модели, которые переносит import_dump, в порядке зависимостей.
+IMPORT_ORDER = (
+    'blog.category',
+    'blog.location',
+    settings.AUTH_USER_MODEL.lower(),
+    'blog.post',
+    'blog.comment',
+)
+
+
+class DumpError(ValueError):
+    pass
+
+
+class JSONArrayReader:
+    """Читает JSON-массив из потока по одному элементу.
+
+    В памяти держится только прочитанный кусок файла и недочитанный
+    элемент, поэтому размер файла не ограничен объёмом памяти.
+    """
+
+    def __init__(self, stream, chunk_size=CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            raise DumpError('Файл обрывается до конца массива.')
+        chunk = self.stream.read(self.chunk_size)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+
+    def _peek(self):
+        while True:
+            while (self.position < len(self.buffer)
+                   and self.buffer[self.position].isspace()):
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            self._fill()
+
+    def _decode(self):
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(
+                    self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise DumpError('Некорректный JSON в дампе.')
+            else:
+                # Число на границе куска может продолжаться в следующем.
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            self._fill()
+
+    def __iter__(self):
+        if self._peek() != '[':
+            raise DumpError('Дамп должен быть JSON-массивом.')
+        self.position += 1
+        if self._peek() == ']':
+            return
+        while True:
+            self._peek()
+            yield self._decode()
+            char = self._peek()
+            self.position += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise DumpError(f'Неожиданный символ {char!r} в дампе.')
+
+
+def _create_m2m(deserialized):
+    model = type(deserialized[0].object)
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+        source = f'{field.m2m_field_name()}_id'
+        target = f'{field.m2m_reverse_field_name()}_id'
+        through.objects.bulk_create(
+            through(**{source: item.object.pk, target: value})
+            for item in deserialized
+            for value in (item.m2m_data or {}).get(field.name, ())
+        )
+
+
+def save_batch(items):
+    deserialized = list(serializers.deserialize(
+        'python', items, ignorenonexistent=True))
+    model = type(deserialized[0].object)
+    model._base_manager.bulk_create(item.object for item in deserialized)
+    _create_m2m(deserialized)
+    return model
+
+
+def import_dump(stream, batch_size, on_flush=None):
+    """Загружает дамп dumpdata пачками по batch_size строк модели.
+
+    Пачки сохраняются в порядке IMPORT_ORDER. Ссылки вперёд, когда,
+    например, комментарий в файле идёт раньше публикации, допустимы:
+    внешние ключи проверяются при фиксации транзакции, в которой
+    должен выполняться импорт. Возвращает счётчики импортированных и
+    пропущенных объектов по моделям.
+    """
+    buffers = defaultdict(list)
+    imported = Counter()
+    skipped = Counter()
+    models = set()
+
+    def flush():
+        for label in IMPORT_ORDER:
+            items = buffers.pop(label, None)
+            if items:
+                models.add(save_batch(items))
+                imported[label] += len(items)
+        # При DEBUG соединение запоминает текст каждого INSERT.
+        reset_queries()
+        if on_flush:
+            on_flush(imported)
+
+    for item in JSONArrayReader(stream):
+        label = item.get('model', '').lower()
+        if label not in IMPORT_ORDER:
+            skipped[label] += 1
+            continue
+        buffers[label].append(item)
+        if len(buffers[label]) >= batch_size:
+            flush()
+    flush()
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+    return imported, skipped
+
+
+class RateReporter:
+    """Печатает количество строк и скорость импорта."""
+
+    def __init__(self, write):
+        self.write = write
+        self.started = time.perf_counter()
+
+    def rate(self, rows):
+        elapsed = time.perf_counter() - self.started
+        return rows / elapsed if elapsed else 0.0
+
+    def __call__(self, imported):
+        rows = sum(imported.values())
+        self.write(f'{rows} строк, {self.rate(rows):.0f} строк/с')
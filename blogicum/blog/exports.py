@@ -0,0 +1,73 @@
+import csv
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+
+from blog.models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ('jsonl', 'csv')
+
+# Выгружаемые поля; пароли и адреса почты пользователей не выгружаются.
+EXPORTS = {
+    'posts': (Post, (
+        'id', 'title', 'text', 'pub_date', 'author_id', 'category_id',
+        'location_id', 'is_published', 'created_at', 'comment_count',
+    )),
+    'comments': (Comment, (
+        'id', 'post_id', 'author_id', 'text', 'created_at',
+    )),
+    'categories': (Category, (
+        'id', 'title', 'description', 'slug', 'is_published', 'created_at',
+    )),
+    'locations': (Location, (
+        'id', 'name', 'is_published', 'created_at',
+    )),
+    'users': (User, (
+        'id', 'username', 'first_name', 'last_name', 'is_active',
+        'is_staff', 'date_joined',
+    )),
+}
+
+
+class Echo:
+    """Псевдофайл для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(name, chunk_size):
+    model, fields = EXPORTS[name]
+    # iterator() читает строки пачками, на PostgreSQL — через серверный
+    # курсор, поэтому память не зависит от размера таблицы.
+    return model._base_manager.order_by('pk').values_list(
+        *fields).iterator(chunk_size=chunk_size)
+
+
+def iter_lines(name, export_format, chunk_size):
+    fields = EXPORTS[name][1]
+    rows = iter_rows(name, chunk_size)
+    if export_format == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow(row)
+        return
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+
+def export_chunks(name, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """Отдаёт выгрузку таблицы кусками текста по chunk_size строк."""
+    chunk = []
+    for line in iter_lines(name, export_format, chunk_size):
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
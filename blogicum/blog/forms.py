@@ -2,6 +2,7 @@ from django import forms
 from django.contrib.auth import get_user_model
 
 from blog.models import Post, Comment
+from blog.tasks import make_post_image_variants
 
 User = get_user_model()
 
@@ -33,6 +34,20 @@ class PostForm(forms.ModelForm):
                 attrs={"class": "form-control-file"}),
         }
 
+    def save(self, commit=True):
+        post = super().save(commit=commit)
+        if commit and "image" in self.changed_data:
+            self._update_image_variants(post)
+        return post
+
+    def _update_image_variants(self, post):
+        stale_variants, post.image_variants = post.image_variants, {}
+        if stale_variants:
+            post.save(update_fields=["image_variants"])
+        if post.image or stale_variants:
+            make_post_image_variants.delay(
+                post.pk, post.image.name or "", stale_variants)
+
 
 class CommentForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,55 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Ширина уменьшенных копий изображения публикации в пикселях. Карточка
+# в ленте и на странице публикации занимает 40rem (640px), поэтому
+# detail и retina покрывают экраны с плотностью пикселей 2x и 3x.
+IMAGE_VARIANTS = {
+    'card': 640,
+    'detail': 1280,
+    'retina': 1920,
+}
+JPEG_QUALITY = 80
+
+
+def _encode_jpeg(image):
+    buffer = BytesIO()
+    image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True,
+               progressive=True)
+    return ContentFile(buffer.getvalue())
+
+
+def make_image_variants(image):
+    """Сохраняет уменьшенные копии изображения рядом с оригиналом.
+
+    Возвращает словарь {вариант: {'name': ..., 'width': ...}}. Варианты
+    шире оригинала не создаются: изображение не увеличивается.
+    """
+    storage = image.storage
+    path = PurePosixPath(image.name)
+    variants = {}
+    image.open('rb')
+    try:
+        with Image.open(image) as original:
+            original = ImageOps.exif_transpose(original).convert('RGB')
+    finally:
+        image.close()
+    for variant, width in IMAGE_VARIANTS.items():
+        if variants and original.width < width:
+            break
+        resized = original.copy()
+        resized.thumbnail((width, resized.height), Image.Resampling.LANCZOS)
+        name = storage.save(
+            str(path.with_name(f'{path.stem}_{variant}.jpg')),
+            _encode_jpeg(resized),
+        )
+        variants[variant] = {'name': name, 'width': resized.width}
+    return variants
+
+
+def delete_image_variants(storage, variants):
+    for variant in variants.values():
+        storage.delete(variant['name'])
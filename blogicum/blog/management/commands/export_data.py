@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from blog.exports import (
+    EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_chunks, EXPORTS
+)
+
+
+class Command(BaseCommand):
+    help = 'Потоково выгружает таблицу блога в JSONL или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('table', choices=sorted(EXPORTS))
+        parser.add_argument(
+            '--format',
+            choices=EXPORT_FORMATS,
+            default='jsonl',
+            help='Формат выгрузки.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для выгрузки; по умолчанию стандартный вывод.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за один раз.',
+        )
+
+    def handle(self, *args, **options):
+        chunks = export_chunks(
+            options['table'], options['format'], options['chunk_size'])
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        # newline='' — csv.writer сам пишет окончания строк \r\n.
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(f'Выгрузка записана в {options["output"]}')
@@ -0,0 +1,199 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+from blog.caching import (
+    bump_cache_version, PAGES_VERSION_KEY, POSTS_VERSION_KEY
+)
+from blog.category_feeds import rebuild_category_feeds
+from blog.models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+BATCH_SIZE = 2000
+TEXT_POOL_SIZE = 500
+PAST_DAYS = 730
+FUTURE_DAYS = 60
+# Показатель распределения Парето (со сдвигом к нулю) для числа
+# комментариев: у большинства публикаций их почти нет, у немногих — сотни.
+COMMENTS_PARETO_ALPHA = 1.2
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, категориями, '
+        'местоположениями, публикациями и комментариями.'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in (
+            ('users', 1000),
+            ('categories', 20),
+            ('locations', 100),
+            ('posts', 10000),
+            ('comments', 50000),
+        ):
+            parser.add_argument(
+                f'--{name}', type=int, default=default,
+                help=f'Сколько создать (по умолчанию {default}).',
+            )
+        parser.add_argument(
+            '--future-share', type=float, default=0.05,
+            help='Доля отложенных публикаций с датой в будущем.',
+        )
+        parser.add_argument(
+            '--unpublished-share', type=float, default=0.05,
+            help='Доля снятых с публикации публикаций и категорий.',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=42,
+            help='Зерно генератора: одинаковое зерно даёт одинаковые данные.',
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.random = random.Random(options['seed'])
+        self.faker = Faker('ru_RU')
+        self.faker.seed_instance(options['seed'])
+        self.titles = [self.faker.sentence(nb_words=5)[:256]
+                       for _ in range(TEXT_POOL_SIZE)]
+        self.texts = [self.faker.paragraph(nb_sentences=8)
+                      for _ in range(TEXT_POOL_SIZE)]
+        self.comments = [self.faker.sentence(nb_words=12)
+                         for _ in range(TEXT_POOL_SIZE)]
+        started = time.perf_counter()
+        with transaction.atomic():
+            user_ids = self.create_users()
+            category_ids = self.create_categories()
+            location_ids = self.create_locations()
+            post_ids = self.create_posts(
+                user_ids, category_ids, location_ids)
+            self.create_comments(user_ids, post_ids)
+            # bulk_create не отправляет сигналы, которые ведут ленты.
+            rebuild_category_feeds()
+        bump_cache_version(POSTS_VERSION_KEY)
+        bump_cache_version(PAGES_VERSION_KEY)
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово за {time.perf_counter() - started:.1f} с'
+        ))
+
+    def bulk_create(self, model, objects):
+        """Сохраняет объекты пачками и возвращает id созданных строк.
+
+        SQLite не возвращает id из bulk_create, поэтому они выбираются
+        после вставки как всё, что больше прежнего максимума.
+        """
+        last_id = model.objects.aggregate(last=Max('id'))['last'] or 0
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_create(batch)
+                batch = []
+        model.objects.bulk_create(batch)
+        ids = list(model.objects.filter(id__gt=last_id).order_by(
+            'id').values_list('id', flat=True))
+        self.stdout.write(f'{model._meta.verbose_name_plural}: {len(ids)}')
+        return ids
+
+    @staticmethod
+    def next_number(model):
+        """Смещение для уникальных имён при повторном запуске."""
+        return model.objects.aggregate(last=Max('id'))['last'] or 0
+
+    def is_unpublished(self):
+        return self.random.random() < self.options['unpublished_share']
+
+    def create_users(self):
+        password = make_password(None)
+        start = self.next_number(User)
+        return self.bulk_create(User, (
+            User(
+                username=f'{self.faker.user_name()}{start + i}'[:150],
+                first_name=self.faker.first_name(),
+                last_name=self.faker.last_name(),
+                password=password,
+            )
+            for i in range(self.options['users'])
+        ))
+
+    def create_categories(self):
+        start = self.next_number(Category)
+        return self.bulk_create(Category, (
+            Category(
+                title=self.faker.word().capitalize()[:256],
+                description=self.random.choice(self.texts),
+                slug=f'category-{start + i}',
+                is_published=not self.is_unpublished(),
+            )
+            for i in range(self.options['categories'])
+        ))
+
+    def create_locations(self):
+        return self.bulk_create(Location, (
+            Location(name=self.faker.city()[:256])
+            for _ in range(self.options['locations'])
+        ))
+
+    def pub_date(self, now):
+        if self.random.random() < self.options['future_share']:
+            return now + timedelta(
+                seconds=self.random.randint(60, FUTURE_DAYS * 86400))
+        return now - timedelta(
+            seconds=self.random.randint(0, PAST_DAYS * 86400))
+
+    def comment_counts(self):
+        """Раскладывает --comments по публикациям с длинным хвостом."""
+        n_posts, total = self.options['posts'], self.options['comments']
+        if not n_posts:
+            return []
+        weights = [self.random.paretovariate(COMMENTS_PARETO_ALPHA) - 1
+                   for _ in range(n_posts)]
+        scale = total / sum(weights)
+        counts = [int(weight * scale) for weight in weights]
+        for index in self.random.choices(
+                range(n_posts), weights=weights, k=total - sum(counts)):
+            counts[index] += 1
+        return counts
+
+    def create_posts(self, user_ids, category_ids, location_ids):
+        now = timezone.now()
+        return self.bulk_create(Post, (
+            Post(
+                title=self.random.choice(self.titles),
+                text=self.random.choice(self.texts),
+                pub_date=self.pub_date(now),
+                author_id=self.random.choice(user_ids),
+                category_id=self.random.choice(category_ids),
+                location_id=(self.random.choice(location_ids)
+                             if location_ids and self.random.random() < 0.7
+                             else None),
+                is_published=not self.is_unpublished(),
+                comment_count=comment_count,
+            )
+            for comment_count in self.comment_counts()
+        ))
+
+    def create_comments(self, user_ids, post_ids):
+        if not post_ids:
+            return
+        posts = Post.objects.filter(
+            id__gte=post_ids[0], comment_count__gt=0,
+        ).values_list('id', 'comment_count').iterator()
+        self.bulk_create(Comment, (
+            Comment(
+                post_id=post_id,
+                author_id=self.random.choice(user_ids),
+                text=self.random.choice(self.comments),
+            )
+            for post_id, comment_count in posts
+            for _ in range(comment_count)
+        ))
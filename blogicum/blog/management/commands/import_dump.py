@@ -0,0 +1,56 @@
+import gzip
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from blog.caching import (
+    bump_cache_version, PAGES_VERSION_KEY, POSTS_VERSION_KEY
+)
+from blog.category_feeds import rebuild_category_feeds
+from blog.dumps import DumpError, import_dump, RateReporter
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково загружает дамп dumpdata (JSON, можно .gz): категории, '
+        'местоположения, пользователей, публикации и комментарии.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу дампа.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество строк одной модели в одном INSERT.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        opener = gzip.open if path.endswith('.gz') else open
+        reporter = RateReporter(self.stdout.write)
+        try:
+            with opener(path, 'rt', encoding='utf-8') as stream:
+                with transaction.atomic():
+                    imported, skipped = import_dump(
+                        stream, options['batch_size'], reporter)
+        except (OSError, DumpError) as error:
+            raise CommandError(error)
+        except IntegrityError as error:
+            raise CommandError(
+                f'Дамп конфликтует с данными в базе, импорт отменён: {error}')
+        # bulk_create не отправляет сигналы: счётчики комментариев, ленты
+        # категорий и кэш страниц обновляются явно.
+        if imported['blog.post'] or imported['blog.comment']:
+            call_command('recount_comments', stdout=self.stdout)
+        if imported['blog.post'] or imported['blog.category']:
+            rebuild_category_feeds()
+        bump_cache_version(POSTS_VERSION_KEY)
+        bump_cache_version(PAGES_VERSION_KEY)
+        for label, count in sorted(skipped.items()):
+            self.stdout.write(f'Пропущено {label}: {count}')
+        rows = sum(imported.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено строк: {rows}, {reporter.rate(rows):.0f} строк/с'
+        ))
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённое количество комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество публикаций, проверяемых за одну транзакцию.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать расхождения, не исправляя их.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        actual_count = Coalesce(
+            Subquery(
+                Comment.objects.filter(
+                    post=OuterRef('pk')
+                ).order_by().values('post').annotate(
+                    total=Count('pk')
+                ).values('total')
+            ),
+            0,
+        )
+        checked = drifted = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                Post.objects.filter(
+                    pk__gt=last_pk
+                ).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1]
+            checked += len(batch)
+            with transaction.atomic():
+                drifted_pks = list(
+                    Post.objects.filter(pk__in=batch).annotate(
+                        actual=actual_count
+                    ).exclude(
+                        comment_count=F('actual')
+                    ).values_list('pk', flat=True)
+                )
+                drifted += len(drifted_pks)
+                if drifted_pks and not options['dry_run']:
+                    Post.objects.filter(pk__in=drifted_pks).update(
+                        comment_count=actual_count,
+                        card_version=F('card_version') + 1,
+                    )
+        action = 'найдено' if options['dry_run'] else 'исправлено'
+        self.stdout.write(self.style.SUCCESS(
+            f'Проверено публикаций: {checked}, {action} расхождений: {drifted}'
+        ))
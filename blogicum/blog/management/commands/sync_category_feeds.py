@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from blog.caching import (
+    bump_cache_version, PAGES_VERSION_KEY, POSTS_VERSION_KEY
+)
+from blog.category_feeds import promote_due_posts, rebuild_category_feeds
+
+
+class Command(BaseCommand):
+    help = (
+        'Добавляет в ленты категорий наступившие отложенные публикации. '
+        'Запускается по расписанию на случай, если очередь задач отстала.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Собрать ленты заново, например после loaddata.',
+        )
+
+    def handle(self, *args, **options):
+        if not options['rebuild']:
+            promoted = promote_due_posts()
+            self.stdout.write(f'Добавлено в ленты: {promoted}')
+            return
+        total = rebuild_category_feeds()
+        bump_cache_version(POSTS_VERSION_KEY)
+        bump_cache_version(PAGES_VERSION_KEY)
+        self.stdout.write(self.style.SUCCESS(f'Строк в лентах: {total}'))
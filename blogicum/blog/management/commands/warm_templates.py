@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.utils import warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Компилирует все шаблоны проекта и сообщает об ошибках в них.'
+
+    def handle(self, *args, **options):
+        errors = []
+
+        def report_error(name, error):
+            errors.append(name)
+            self.stderr.write(f'{name}: {error}')
+
+        started = time.perf_counter()
+        names = warm_templates(on_error=report_error)
+        elapsed = (time.perf_counter() - started) * 1000
+        for name in names:
+            self.stdout.write(name, self.style.SQL_FIELD)
+        if errors:
+            raise CommandError(
+                f'Не скомпилировано шаблонов: {len(errors)} из '
+                f'{len(errors) + len(names)}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Скомпилировано шаблонов: {len(names)} за {elapsed:.1f} мс'
+        ))
@@ -0,0 +1,145 @@
+import heapq
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from operator import itemgetter
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Верхние границы корзин гистограмм: миллисекунды и число запросов.
+TIME_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+UNRESOLVED_VIEW = '<unresolved>'
+
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+    """Счётчики одного запроса; сам объект служит execute_wrapper."""
+
+    def __init__(self, keep_queries=False):
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.queries = [] if keep_queries else None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.query_count += 1
+            self.sql_time += duration
+            if self.queries is not None:
+                self.queries.append((duration, sql))
+
+    def top_queries(self, limit):
+        return heapq.nlargest(limit, self.queries or (), key=itemgetter(0))
+
+
+def record_template_time(seconds):
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.template_time += seconds
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def as_dict(self, requests):
+        return {
+            'buckets': [
+                [bound, count]
+                for bound, count in zip((*self.bounds, None), self.counts)
+            ],
+            'mean': round(self.total / requests, 2),
+            'max': round(self.max, 2),
+        }
+
+
+class ViewStats:
+    def __init__(self):
+        self.requests = 0
+        self.histograms = {
+            'wall_ms': Histogram(TIME_BUCKETS),
+            'sql_ms': Histogram(TIME_BUCKETS),
+            'template_ms': Histogram(TIME_BUCKETS),
+            'queries': Histogram(QUERY_BUCKETS),
+        }
+
+    def add(self, metrics, wall_time):
+        self.requests += 1
+        for name, value in (
+            ('wall_ms', wall_time * 1000),
+            ('sql_ms', metrics.sql_time * 1000),
+            ('template_ms', metrics.template_time * 1000),
+            ('queries', metrics.query_count),
+        ):
+            self.histograms[name].add(value)
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            **{
+                name: histogram.as_dict(self.requests)
+                for name, histogram in self.histograms.items()
+            },
+        }
+
+
+_stats = defaultdict(ViewStats)
+_lock = threading.Lock()
+
+
+def get_view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else UNRESOLVED_VIEW
+
+
+def record_request(request, metrics, wall_time):
+    """Добавляет запрос в статистику представления, медленный — в лог."""
+    view_name = get_view_name(request)
+    with _lock:
+        _stats[view_name].add(metrics, wall_time)
+    slow_ms = settings.REQUEST_METRICS_SLOW_MS
+    if slow_ms is None or wall_time * 1000 < slow_ms:
+        return
+    top_queries = ''.join(
+        f'\n  {duration * 1000:.1f} мс: {sql}'
+        for duration, sql in metrics.top_queries(
+            settings.REQUEST_METRICS_TOP_QUERIES)
+    )
+    logger.warning(
+        'Медленный запрос %s %s (%s): %.0f мс, SQL: %d за %.0f мс, '
+        'шаблоны: %.0f мс%s',
+        request.method, request.path, view_name, wall_time * 1000,
+        metrics.query_count, metrics.sql_time * 1000,
+        metrics.template_time * 1000, top_queries,
+    )
+
+
+def get_stats():
+    """Статистика текущего процесса по представлениям."""
+    with _lock:
+        return {name: stats.as_dict() for name, stats in sorted(
+            _stats.items())}
+
+
+def reset_stats():
+    with _lock:
+        _stats.clear()
@@ -0,0 +1,80 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from blog.metrics import current_metrics, record_request, RequestMetrics
+from blog.routers import replica_reads
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_COOKIE = 'primary_db_pin'
+
+
+def is_pinned_to_primary(request):
+    try:
+        return float(request.COOKIES[PIN_COOKIE]) > time.time()
+    except (KeyError, ValueError):
+        return False
+
+
+class ReplicaRoutingMiddleware:
+    """Включает чтение с реплик для страниц из `REPLICA_READ_VIEWS`.
+
+    После любого изменяющего запроса клиент на `REPLICA_PIN_SECONDS`
+    закрепляется за основной базой, чтобы видеть собственные правки
+    несмотря на отставание реплик.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Не reset(token): при ASGI process_view и __call__ синхронного
+        # middleware выполняются в разных копиях контекста, и токен из
+        # одной нельзя сбросить в другой.
+        previous = replica_reads.get()
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads.set(previous)
+        if request.method not in SAFE_METHODS:
+            pin_seconds = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(
+                PIN_COOKIE, str(time.time() + pin_seconds),
+                max_age=pin_seconds, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (request.method in SAFE_METHODS
+                and request.resolver_match.view_name
+                in settings.REPLICA_READ_VIEWS
+                and not is_pinned_to_primary(request)):
+            replica_reads.set(True)
+
+
+class RequestMetricsMiddleware:
+    """Считает SQL-запросы, время SQL, шаблонов и всего запроса.
+
+    Статистика копится по `request.resolver_match.view_name` и доступна
+    сотрудникам по адресу /api/metrics/. Запросы дольше
+    `REQUEST_METRICS_SLOW_MS` пишутся в лог с самыми долгими SQL.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics(
+            keep_queries=settings.REQUEST_METRICS_SLOW_MS is not None)
+        token = current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                return self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+            record_request(request, metrics, time.perf_counter() - started)
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 16:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='card_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False, help_text='Увеличивается при изменениях, влияющих на карточку публикации в ленте.', verbose_name='Версия карточки'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-18 17:05
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+post_search = import_module('blog.migrations.0008_post_search')
+
+# SQLite пересоздаёт таблицу blog_post при добавлении и удалении столбца,
+# вместе с ней пропадают триггеры полнотекстового индекса из 0008.
+SQLITE_RESTORE_TRIGGERS = (
+    post_search.SQLITE_BACKWARD[:3] + post_search.SQLITE_FORWARD[1:]
+)
+restore_search_triggers = post_search.run_statements(
+    {'sqlite': SQLITE_RESTORE_TRIGGERS})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop,
+                             restore_search_triggers),
+        migrations.AddField(
+            model_name='post',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Уменьшенные копии изображения'),
+        ),
+        migrations.RunPython(restore_search_triggers,
+                             migrations.RunPython.noop),
+    ]
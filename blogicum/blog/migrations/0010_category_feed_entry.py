@@ -0,0 +1,56 @@
+# Generated by Django 3.2.16 on 2026-10-18 17:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+BATCH_SIZE = 2000
+
+
+def fill_category_feeds(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    CategoryFeedEntry = apps.get_model('blog', 'CategoryFeedEntry')
+    posts = Post.objects.filter(
+        is_published=True,
+        pub_date__lte=timezone.now(),
+        category__is_published=True,
+    ).values_list('pk', 'category_id', 'pub_date').order_by('pk')
+    last_pk = 0
+    while True:
+        batch = [
+            CategoryFeedEntry(post_id=pk, category_id=category_id,
+                              pub_date=pub_date)
+            for pk, category_id, pub_date in posts.filter(
+                pk__gt=last_pk)[:BATCH_SIZE]
+        ]
+        if not batch:
+            break
+        CategoryFeedEntry.objects.bulk_create(batch)
+        last_pk = batch[-1].post_id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryFeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+                ('category', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='blog.category', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'строка ленты категории',
+                'verbose_name_plural': 'Ленты категорий',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='categoryfeedentry',
+            index=models.Index(fields=['category', '-pub_date', '-post'], name='category_feed_entry_idx'),
+        ),
+        migrations.RunPython(fill_category_feeds, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Q
+
+from blog.utils import get_relevant_posts, relevant_posts_filter
 
 User = get_user_model()
 
@@ -45,6 +48,31 @@ class Location(BaseModel):
         return self.name
 
 
+# Поля, которые пишут только сигналы и фоновые задачи (UPDATE с F() или
+# явный update_fields); полное сохранение публикации их не трогает.
+BACKGROUND_FIELDS = ('comment_count', 'card_version', 'image_variants')
+
+CATEGORY_FEED_ORDERING = ('-feed_entry__pub_date', '-feed_entry__post_id')
+
+
+class PostQuerySet(models.QuerySet):
+    def published(self):
+        return get_relevant_posts(self)
+
+    def visible_to(self, user):
+        if not user.is_authenticated:
+            return self.published()
+        return self.filter(Q(author=user) | relevant_posts_filter())
+
+    def with_related(self):
+        return self.select_related('author', 'category', 'location')
+
+    def in_category_feed(self, category):
+        """Видимые публикации категории по материализованной ленте."""
+        return self.filter(feed_entry__category=category).select_related(
+            'feed_entry').order_by(*CATEGORY_FEED_ORDERING)
+
+
 class Post(BaseModel):
     title = models.CharField('Заголовок', max_length=256)
     text = models.TextField('Текст', )
@@ -76,19 +104,101 @@ class Post(BaseModel):
     )
     image = models.ImageField('Изображение', upload_to='posts/', null=True,
                               blank=True)
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
+    card_version = models.PositiveBigIntegerField(
+        'Версия карточки',
+        default=0,
+        editable=False,
+        help_text='Увеличивается при изменениях, влияющих на карточку '
+                  'публикации в ленте.'
+    )
+    image_variants = models.JSONField(
+        'Уменьшенные копии изображения',
+        default=dict,
+        blank=True,
+        editable=False,
+    )
 
-    @property
-    def comment_count(self):
-        return self.comments.count()
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(is_published=True),
+                name='post_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=models.Q(is_published=True),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+        )
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные значения полей.
+
+        Сигналы сбрасывают по ним кэш страниц прежних категории и автора,
+        если публикацию перенесли.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Не перезаписывает поля, которые ведут сигналы и задачи.
+
+        Счётчик комментариев, версия карточки и уменьшенные копии
+        изображения могут измениться, пока публикация открыта в форме
+        редактирования или в админке; полное сохранение такого
+        экземпляра иначе записало бы устаревшие значения.
+        """
+        if (not args and not self._state.adding and self.pk is not None
+                and kwargs.get('update_fields') is None
+                and not kwargs.get('force_insert')):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in BACKGROUND_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    def image_variant_url(self, variant):
+        """URL уменьшенной копии изображения или оригинала, если копии нет."""
+        if variant in self.image_variants:
+            return self.image.storage.url(self.image_variants[variant]['name'])
+        return self.image.url
+
+    @property
+    def card_image_url(self):
+        return self.image_variant_url('card')
+
+    @property
+    def detail_image_url(self):
+        return self.image_variant_url('detail')
+
+    @property
+    def image_srcset(self):
+        return ', '.join(
+            f'{self.image.storage.url(variant["name"])} {variant["width"]}w'
+            for variant in self.image_variants.values()
+        )
+
 
 class Comment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE,
@@ -100,8 +210,52 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(
+                fields=["post", "created_at", "id"],
+                name="comment_post_created_idx",
+            ),
+        ]
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
 
     def __str__(self):
         return f"Комментарий {self.author.username} к {self.post.title}"
+
+
+class CategoryFeedEntry(models.Model):
+    """Строка материализованной ленты категории.
+
+    Есть только у видимых сейчас публикаций: опубликованных, из
+    опубликованной категории и с наступившей датой публикации. Поддержка
+    таблицы — в blog/category_feeds.py.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feed_entry',
+        verbose_name='Публикация',
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        db_index=False,
+        verbose_name='Категория',
+    )
+    pub_date = models.DateTimeField('Дата и время публикации')
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('category', '-pub_date', '-post'),
+                name='category_feed_entry_idx',
+            ),
+        )
+        verbose_name = 'строка ленты категории'
+        verbose_name_plural = 'Ленты категорий'
+
+    def __str__(self):
+        return f'{self.category_id}: {self.post_id}'
@@ -0,0 +1,216 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import date, datetime, time
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.functional import cached_property
+
+from blog.caching import (
+    get_cache_version, limit_timeout_by_schedule, POSTS_VERSION_KEY
+)
+
+
+def estimate_count(queryset):
+    """Оценка планировщика PostgreSQL для очень больших выборок.
+
+    Возвращает None, если оценка недоступна или меньше порога
+    `POSTS_COUNT_ESTIMATE_THRESHOLD` и нужен точный `COUNT(*)`.
+    """
+    threshold = settings.POSTS_COUNT_ESTIMATE_THRESHOLD
+    connection = connections[queryset.db]
+    if threshold is None or connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    rows = int(plan[0]['Plan']['Plan Rows'])
+    return rows if rows >= threshold else None
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        return super().count if estimate is None else estimate
+
+
+class CachedCountPaginator(Paginator):
+    def __init__(self, object_list, per_page, count_key=None, schedule=None,
+                 **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+        self.schedule = schedule
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return super().count
+        key = (
+            f'blog:post_count:{get_cache_version(POSTS_VERSION_KEY)}:'
+            f'{self.count_key}'
+        )
+        count = cache.get(key)
+        if count is None:
+            count = estimate_count(self.object_list)
+            if count is None:
+                count = super().count
+            cache.set(key, count, limit_timeout_by_schedule(
+                settings.POSTS_COUNT_CACHE_TIMEOUT, self.schedule
+            ))
+        return count
+
+
+class CursorPage(Sequence):
+    cursor_based = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self.object_list)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(
+            self.object_list[0], reverse=True
+        )
+
+
+class CursorPaginator:
+    """Keyset-пагинация по уникальному набору полей сортировки.
+
+    Вместо номера страницы принимает непрозрачный курсор, указывающий
+    на крайний объект соседней страницы, поэтому стоимость запроса
+    не зависит от глубины страницы и не требует `COUNT(*)`. Поля
+    сортировки могут идти через связи; такие связи нужно загрузить
+    через select_related.
+    """
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-id')):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip('-') for name in self.ordering]
+
+    def encode_cursor(self, obj, reverse=False):
+        values = []
+        for name in self.fields:
+            if isinstance(obj, dict):
+                value = obj[name]
+            else:
+                value = reduce(getattr, name.split(LOOKUP_SEP), obj)
+            if isinstance(value, (datetime, date, time)):
+                value = value.isoformat()
+            values.append(value)
+        raw = json.dumps({'v': values, 'r': reverse}).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def get_field(self, name):
+        """Поле сортировки; допускаются пути через связи: `a__b`."""
+        *relations, name = name.split(LOOKUP_SEP)
+        model = self.object_list.model
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.get_field(name)
+
+    def decode_cursor(self, cursor):
+        """Возвращает (значения, направление) или None для битого курсора."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            if len(payload['v']) != len(self.fields):
+                return None
+            values = [
+                self.get_field(name).to_python(value)
+                for name, value in zip(self.fields, payload['v'])
+            ]
+            if None in values:
+                return None
+            return values, bool(payload.get('r'))
+        except (
+            binascii.Error, ValueError, TypeError, KeyError, ValidationError
+        ):
+            return None
+
+    def _seek(self, values, reverse):
+        conditions = []
+        for index, name in enumerate(self.ordering):
+            descending = name.startswith('-')
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition = Q(**{f'{self.fields[index]}__{lookup}': values[index]})
+            for field, value in zip(self.fields[:index], values):
+                condition &= Q(**{field: value})
+            conditions.append(condition)
+        return reduce(or_, conditions)
+
+    def get_page(self, cursor=None):
+        decoded = self.decode_cursor(cursor) if cursor else None
+        if decoded is None:
+            items = list(
+                self.object_list.order_by(*self.ordering)[:self.per_page + 1]
+            )
+            return CursorPage(
+                items[:self.per_page], self,
+                has_next=len(items) > self.per_page, has_previous=False,
+            )
+        values, reverse = decoded
+        if not reverse:
+            items = list(
+                self.object_list.filter(
+                    self._seek(values, reverse=False)
+                ).order_by(*self.ordering)[:self.per_page + 1]
+            )
+            return CursorPage(
+                items[:self.per_page], self,
+                has_next=len(items) > self.per_page, has_previous=True,
+            )
+        reversed_ordering = [
+            name[1:] if name.startswith('-') else f'-{name}'
+            for name in self.ordering
+        ]
+        items = list(
+            self.object_list.filter(
+                self._seek(values, reverse=True)
+            ).order_by(*reversed_ordering)[:self.per_page + 1]
+        )
+        return CursorPage(
+            items[:self.per_page][::-1], self,
+            has_next=True, has_previous=len(items) > self.per_page,
+        )
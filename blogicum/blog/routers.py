@@ -0,0 +1,31 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+def reads_from_replica():
+    """Уходит ли сейчас чтение моделей блога на реплику."""
+    return replica_reads.get() and bool(settings.DATABASE_REPLICAS)
+
+
+class ReplicaRouter:
+    """Отправляет чтение моделей блога на реплики внутри читающих страниц.
+
+    Флаг `replica_reads` выставляет `ReplicaRoutingMiddleware`; вне него,
+    а также для записи и остальных приложений используется `default`.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (reads_from_replica()
+                and model._meta.app_label in settings.REPLICA_APP_LABELS):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
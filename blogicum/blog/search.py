@@ -0,0 +1,49 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+SEARCH_CONFIG = 'russian'
+WORD_RE = re.compile(r'\w+')
+
+
+def get_search_terms(query):
+    return WORD_RE.findall(query.lower())[:10]
+
+
+def search_posts(posts, query):
+    """Фильтрует публикации по словам запроса и сортирует по релевантности.
+
+    На SQLite используется индекс FTS5 `blog_post_fts`, на PostgreSQL —
+    GIN-индекс по `to_tsvector`, на остальных базах — поиск подстроки.
+    """
+    terms = get_search_terms(query)
+    if not terms:
+        return posts.none()
+    vendor = connections[posts.db].vendor
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return posts.extra(
+            tables=['blog_post_fts'],
+            where=[
+                'blog_post_fts.rowid = blog_post.id',
+                'blog_post_fts MATCH %s',
+            ],
+            params=[match],
+            select={'rank': 'bm25(blog_post_fts, 10.0, 1.0)'},
+            order_by=['rank', '-pub_date'],
+        )
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import (
+            SearchQuery, SearchRank, SearchVector
+        )
+
+        vector = SearchVector('title', 'text', config=SEARCH_CONFIG)
+        search_query = SearchQuery(' '.join(terms), config=SEARCH_CONFIG)
+        return posts.annotate(
+            search=vector, rank=SearchRank(vector, search_query)
+        ).filter(search=search_query).order_by('-rank', '-pub_date')
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(text__icontains=term)
+    return posts.filter(condition)
@@ -0,0 +1,158 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete
+)
+from django.dispatch import receiver
+
+from blog.caching import (
+    AUTHOR_SCOPE, bump_cache_version, bump_page_versions, CATEGORY_SCOPE,
+    FEED_SCOPE, PAGES_VERSION_KEY, POST_SCOPE, POSTS_VERSION_KEY
+)
+from blog.category_feeds import FEED_FIELDS, sync_category, sync_post
+from blog.models import Category, Comment, Location, Post, User
+from blog.tasks import bump_card_versions
+
+
+def change_comment_count(post_id, delta):
+    posts = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        posts = posts.filter(comment_count__gte=-delta)
+    posts.update(
+        comment_count=F('comment_count') + delta,
+        card_version=F('card_version') + 1,
+    )
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        change_comment_count(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    change_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Post)
+def increment_card_version(sender, instance, created, raw=False, **kwargs):
+    # UPDATE с F(), а не значение экземпляра: экземпляр мог быть загружен
+    # до комментария, который уже увеличил версию.
+    if not created and not raw:
+        Post.objects.filter(pk=instance.pk).update(
+            card_version=F('card_version') + 1)
+
+
+@receiver(post_save, sender=Post)
+def update_category_feed(sender, instance, update_fields=None, raw=False,
+                         **kwargs):
+    if raw or update_fields and FEED_FIELDS.isdisjoint(update_fields):
+        return
+    sync_post(instance)
+
+
+@receiver(post_save, sender=Category)
+def update_category_feeds(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_category(instance)
+
+
+@receiver(post_save, sender=Category)
+def invalidate_category_cards(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_card_versions.delay(category_id=instance.pk)
+
+
+@receiver(post_save, sender=Location)
+def invalidate_location_cards(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_card_versions.delay(location_id=instance.pk)
+
+
+# При удалении связь у публикаций обнуляется сразу после сигнала, поэтому
+# найти их потом по категории или местоположению уже не получится.
+@receiver(pre_delete, sender=Category)
+def invalidate_deleted_category_cards(sender, instance, **kwargs):
+    bump_card_versions(category=instance)
+
+
+@receiver(pre_delete, sender=Location)
+def invalidate_deleted_location_cards(sender, instance, **kwargs):
+    bump_card_versions(location=instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_post_counts(sender, **kwargs):
+    bump_cache_version(POSTS_VERSION_KEY)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    """Сбрасывает кэш ленты, самой публикации, её категории и автора.
+
+    Если публикацию перенесли в другую категорию, сбрасывается и
+    страница прежней.
+    """
+    loaded = getattr(instance, '_loaded_values', {})
+    category_ids = {instance.category_id, loaded.get('category_id')}
+    author_ids = {instance.author_id, loaded.get('author_id')}
+    bump_page_versions(
+        FEED_SCOPE,
+        POST_SCOPE.format(post_id=instance.pk),
+        *(CATEGORY_SCOPE.format(category_slug=slug)
+          for slug in Category.objects.filter(
+              pk__in=category_ids - {None}).values_list('slug', flat=True)),
+        *(AUTHOR_SCOPE.format(username=username)
+          for username in User.objects.filter(
+              pk__in=author_ids - {None}).values_list('username', flat=True)),
+    )
+    instance._loaded_values = {
+        **loaded,
+        'category_id': instance.category_id,
+        'author_id': instance.author_id,
+    }
+
+
+# Счётчик комментариев в карточках лент может отставать на время жизни
+# кэша страницы: сбрасывать из-за комментария все ленты слишком дорого.
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    bump_page_versions(POST_SCOPE.format(post_id=instance.post_id))
+
+
+# Категории, местоположения и имена пользователей видны в карточках и на
+# страницах публикаций по всему сайту, а меняются редко: сбрасывается
+# общая версия страниц.
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=User)
+def invalidate_pages(sender, **kwargs):
+    bump_cache_version(PAGES_VERSION_KEY)
+
+
+@receiver(post_save, sender=User)
+def invalidate_pages_on_user_change(sender, instance, created,
+                                    update_fields=None, raw=False, **kwargs):
+    if created or update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_cache_version(PAGES_VERSION_KEY)
+    if not raw:
+        bump_card_versions.delay(author_id=instance.pk)
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite' or not settings.SQLITE_PRAGMAS:
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
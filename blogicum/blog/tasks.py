@@ -0,0 +1,42 @@
+from django.db.models import F
+
+from blog.caching import bump_cache_version, PAGES_VERSION_KEY
+from blog.images import delete_image_variants, make_image_variants
+from blog.models import Post
+from taskqueue.queue import task
+
+
+@task
+def make_post_image_variants(post_id, image_name, stale_variants=None):
+    """Создаёт уменьшенные копии изображения публикации.
+
+    Если изображение успели заменить, задача ничего не делает: копии
+    создаст задача, поставленная при замене.
+    """
+    if stale_variants:
+        storage = Post._meta.get_field('image').storage
+        delete_image_variants(storage, stale_variants)
+    post = Post.objects.filter(pk=post_id, image=image_name).first()
+    if post is None or not post.image:
+        return
+    post.image_variants = make_image_variants(post.image)
+    post.save(update_fields=('image_variants',))
+
+
+@task
+def bump_card_versions(**lookups):
+    """Сбрасывает кэш карточек публикаций, подходящих под `lookups`.
+
+    UPDATE не отправляет сигналов, поэтому кэш страниц сбрасывается
+    здесь же: иначе страница, закэшированная между сохранением объекта
+    и выполнением задачи, так и покажет старые карточки.
+    """
+    Post.objects.filter(**lookups).update(card_version=F('card_version') + 1)
+    bump_cache_version(PAGES_VERSION_KEY)
+
+
+@task
+def promote_scheduled_posts():
+    from blog.category_feeds import promote_due_posts
+
+    promote_due_posts()
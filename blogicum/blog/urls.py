@@ -1,13 +1,23 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 
 app_name = 'blog'
 
+if settings.BLOG_ASYNC_VIEWS:
+    read_views = async_views
+    index_view = async_views.index_view
+else:
+    read_views = views
+    index_view = views.IndexView.as_view()
+
 urlpatterns = [
-    path('', views.IndexView.as_view(), name='index'),
-    path('profile/<slug:username>/', views.user_profile_view, name='profile'),
+    path('', index_view, name='index'),
+    path('profile/<slug:username>/', read_views.user_profile_view,
+         name='profile'),
     path('edit_profile/', views.edit_profile, name='edit_profile'),
-    path('posts/<int:post_id>/', views.post_detail_view, name='post_detail'),
+    path('posts/<int:post_id>/', read_views.post_detail_view,
+         name='post_detail'),
     path('posts/create/', views.post_create_view, name='create_post'),
     path('posts/<int:post_id>/edit/', views.post_update_view,
          name='edit_post'),
@@ -15,10 +25,13 @@ urlpatterns = [
          name='delete_post'),
     path('posts/<int:post_id>/comment/', views.comment_create_view,
          name='add_comment'),
+    path('posts/<int:post_id>/comments/', views.comment_list_view,
+         name='comments'),
     path('posts/<int:post_id>/edit_comment/<int:comment_id>',
          views.comment_update_view, name='edit_comment'),
     path('posts/<int:post_id>/delete_comment/<int:comment_id>',
          views.comment_delete_view, name='delete_comment'),
-    path('category/<slug:category_slug>/', views.category_posts_view,
+    path('category/<slug:category_slug>/', read_views.category_posts_view,
          name='category_posts'),
+    path('search/', views.search_view, name='search'),
 ]
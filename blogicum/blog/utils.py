@@ -1,13 +1,74 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Q
+from django.template import (
+    engines, TemplateDoesNotExist, TemplateSyntaxError
+)
 from django.utils import timezone
 
+from blog.paginators import CachedCountPaginator, CursorPaginator
+
+POSTS_PER_PAGE = 10
+COMMENTS_PER_PAGE = 50
+
+
+def relevant_posts_filter():
+    return Q(
+        is_published=True,
+        pub_date__lte=timezone.now(),
+        category__is_published=True,
+    )
+
 
 def get_relevant_posts(posts):
-    return (
-        posts.filter(
-            is_published=True
-        ).filter(
-            pub_date__lte=timezone.now()
-        ).filter(
-            category__is_published=True
-        )
+    return posts.filter(relevant_posts_filter())
+
+
+def paginate_posts(request, posts, per_page=POSTS_PER_PAGE, count_key=None,
+                   schedule=None, ordering=('-pub_date', '-id')):
+    """Страница публикаций по курсору или по номеру.
+
+    `ordering=None` — выборка уже отсортирована не по полям модели
+    (например, по релевантности поиска): такую выборку курсор не
+    продолжит, поэтому она всегда листается по номеру страницы.
+    """
+    if settings.POSTS_CURSOR_PAGINATION and ordering is not None:
+        paginator = CursorPaginator(posts, per_page, ordering=ordering)
+        return paginator.get_page(request.GET.get('cursor'))
+    paginator = CachedCountPaginator(
+        posts, per_page, count_key=count_key, schedule=schedule
+    )
+    return paginator.get_page(request.GET.get('page'))
+
+
+def paginate_comments(request, post):
+    paginator = CursorPaginator(
+        post.comments.select_related('author'),
+        COMMENTS_PER_PAGE,
+        ordering=('created_at', 'id'),
     )
+    return paginator.get_page(request.GET.get('cursor'))
+
+
+def warm_templates(on_error=None):
+    """Компилирует шаблоны из `DIRS`, заполняя кэширующий загрузчик.
+
+    Без `on_error` первая ошибка компиляции прерывает прогрев; иначе
+    `on_error(name, error)` вызывается для каждого сломанного шаблона,
+    и прогрев продолжается. Возвращает имена скомпилированных шаблонов.
+    """
+    names = []
+    for engine in engines.all():
+        for directory in engine.engine.dirs:
+            for path in sorted(Path(directory).rglob('*.html')):
+                name = path.relative_to(directory).as_posix()
+                try:
+                    engine.get_template(name)
+                except (TemplateDoesNotExist, TemplateSyntaxError) as error:
+                    if on_error is None:
+                        raise
+                    on_error(name, error)
+                    continue
+                names.append(name)
+    return names
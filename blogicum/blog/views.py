@@ -1,35 +1,65 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.db import transaction
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse
-from django.views.generic import ListView
-
+from django.utils.http import urlencode
+from django.utils.decorators import method_decorator
+from django.views.generic import TemplateView
+
+from blog.caching import (
+    cache_anonymous_page, AUTHOR_SCOPE, CATEGORY_SCOPE, FEED_SCOPE, POST_SCOPE
+)
+from blog.category_feeds import promote_if_due
 from blog.forms import UserEditForm, PostForm, CommentForm
-from blog.models import Post, Category, Comment
-from blog.utils import get_relevant_posts
+from blog.models import CATEGORY_FEED_ORDERING, Post, Category, Comment
+from blog.routers import reads_from_replica
+from blog.search import search_posts
+from blog.utils import paginate_comments, paginate_posts
 
 User = get_user_model()
 
 
-class IndexView(ListView):
-    model = Post
+def get_index_context(request):
+    posts = Post.objects.published().with_related()
+    page_obj = paginate_posts(request, posts, count_key='index', schedule={})
+    return {"page_obj": page_obj}
+
+
+@method_decorator(
+    cache_anonymous_page(schedule={}, scope=FEED_SCOPE), name='dispatch')
+class IndexView(TemplateView):
     template_name = "blog/index.html"
-    context_object_name = "post_list"
-    paginate_by = 10
 
-    def get_queryset(self):
-        return get_relevant_posts(Post.objects)
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(get_index_context(self.request))
+        return context
 
 
-def post_detail_view(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
-    if request.user != post.author:
-        post = get_object_or_404(get_relevant_posts(Post.objects), id=post_id)
-    comments = Comment.objects.filter(post=post)
+def get_post_detail_context(request, post_id):
+    post = get_object_or_404(
+        Post.objects.visible_to(request.user).with_related(), id=post_id
+    )
+    comments = paginate_comments(request, post)
     form = CommentForm()
-    return render(request, "blog/detail.html", {
-        "post": post, "form": form, "comments": comments
+    return {"post": post, "form": form, "comments": comments}
+
+
+@cache_anonymous_page(scope=POST_SCOPE)
+def post_detail_view(request, post_id):
+    return render(
+        request, "blog/detail.html", get_post_detail_context(request, post_id)
+    )
+
+
+@cache_anonymous_page(scope=POST_SCOPE)
+def comment_list_view(request, post_id):
+    post = get_object_or_404(Post.objects.visible_to(request.user), id=post_id)
+    comments = paginate_comments(request, post)
+    return render(request, "includes/comment_list.html", {
+        "post": post, "comments": comments
     })
 
 
@@ -80,7 +110,8 @@ def comment_create_view(request, post_id):
         if form.is_valid():
             form.instance.author = request.user
             form.instance.post = post
-            form.save()
+            with transaction.atomic():
+                form.save()
             return redirect("blog:post_detail", post_id=post.id)
     else:
         form = CommentForm()
@@ -110,32 +141,58 @@ def comment_delete_view(request, post_id, comment_id):
     if comment.author != request.user:
         return redirect("blog:post_detail", post_id=post_id)
     if request.method == 'POST':
-        comment.delete()
+        with transaction.atomic():
+            comment.delete()
         return redirect("blog:post_detail", post_id=post_id)
     return render(request, "blog/comment.html", {"comment": comment})
 
 
-def category_posts_view(request, category_slug):
+def get_category_context(request, category_slug):
     category = get_object_or_404(Category.objects.filter(is_published=True),
                                  slug=category_slug)
-    posts = get_relevant_posts(category.posts.filter(category=category))
-    paginator = Paginator(posts, 10)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
-    return render(request, "blog/category.html", {
-        "page_obj": page_obj, "category": category
-    })
+    if settings.TASKS_EAGER and not reads_from_replica():
+        promote_if_due()
+    posts = Post.objects.in_category_feed(category).with_related()
+    page_obj = paginate_posts(
+        request, posts, count_key=f'category:{category.id}',
+        schedule={'category__slug': category.slug},
+        ordering=CATEGORY_FEED_ORDERING,
+    )
+    return {"page_obj": page_obj, "category": category}
+
+
+@cache_anonymous_page(schedule={'category_slug': 'category__slug'},
+                      scope=CATEGORY_SCOPE)
+def category_posts_view(request, category_slug):
+    return render(
+        request, "blog/category.html",
+        get_category_context(request, category_slug),
+    )
 
 
-def user_profile_view(request, username):
+def get_profile_context(request, username):
     user = get_object_or_404(User, username=username)
-    posts = Post.objects.filter(author=user)
-    paginator = Paginator(posts, 10)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
-    return render(request, "blog/profile.html", {
-        "profile": user,
+    posts = user.posts.with_related()
+    page_obj = paginate_posts(request, posts, count_key=f'profile:{user.id}')
+    return {"profile": user, "page_obj": page_obj}
+
+
+@cache_anonymous_page(scope=AUTHOR_SCOPE)
+def user_profile_view(request, username):
+    return render(
+        request, "blog/profile.html", get_profile_context(request, username)
+    )
+
+
+@cache_anonymous_page(schedule={}, scope=FEED_SCOPE)
+def search_view(request):
+    query = request.GET.get("q", "").strip()
+    posts = search_posts(Post.objects.published().with_related(), query)
+    page_obj = paginate_posts(request, posts, ordering=None)
+    return render(request, "blog/search.html", {
+        "query": query,
         "page_obj": page_obj,
+        "page_query": urlencode({"q": query}) + "&",
     })
 
 
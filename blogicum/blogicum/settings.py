@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,9 +44,12 @@ INSTALLED_APPS = [
 
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
+    'api.apps.ApiConfig',
+    'taskqueue.apps.TaskQueueConfig',
 ]
 
 MIDDLEWARE = [
+    'blog.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -53,6 +57,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blog.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'blogicum.urls'
@@ -61,7 +66,7 @@ TEMPLATES_DIR = BASE_DIR / 'templates'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'blog.templating.TimedDjangoTemplates',
         'DIRS': [
             TEMPLATES_DIR,
         ],
@@ -89,6 +94,31 @@ DATABASES = {
     }
 }
 
+DATABASE_REPLICAS = []
+
+if os.getenv('BLOG_REPLICA_DB'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('BLOG_REPLICA_DB'),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS = ['replica']
+
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+
+REPLICA_APP_LABELS = ('blog',)
+
+REPLICA_READ_VIEWS = (
+    'blog:index',
+    'blog:category_posts',
+    'blog:profile',
+    'blog:post_detail',
+)
+
+REPLICA_PIN_SECONDS = 5
+
+SQLITE_PRAGMAS = {}
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -113,8 +143,39 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+# Бэкенд, через который фоновая задача отправляет письма, поставленные
+# в очередь бэкендом taskqueue.mail.QueuedEmailBackend.
+TASKS_EMAIL_BACKEND = EMAIL_BACKEND
+
+# При True фоновые задачи выполняются сразу в процессе, который их
+# поставил, — так при разработке всё работает без воркера. В боевых
+# настройках задачи ставятся в очередь для `python manage.py run_worker`.
+TASKS_EAGER = True
+
+TASKS_RETRY_DELAY = 10
+
+TASKS_RUNNING_TIMEOUT = 600
+
 LOGIN_URL = "/auth/login/"
 
+POSTS_CURSOR_PAGINATION = False
+
+POSTS_COUNT_CACHE_TIMEOUT = 60
+
+POSTS_COUNT_ESTIMATE_THRESHOLD = 100000
+
+PAGE_CACHE_TIMEOUT = 300
+
+WARM_TEMPLATES_ON_STARTUP = False
+
+BLOG_ASYNC_VIEWS = os.getenv('BLOG_ASYNC_VIEWS') == '1'
+
+# Запросы дольше этого порога в миллисекундах пишутся в лог blog.metrics
+# вместе с REQUEST_METRICS_TOP_QUERIES самыми долгими SQL; None отключает.
+REQUEST_METRICS_SLOW_MS = 500
+
+REQUEST_METRICS_TOP_QUERIES = 5
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.2/topics/i18n/
 
@@ -0,0 +1,37 @@
+from copy import deepcopy
+
+from blogicum.settings import *  # noqa: F401, F403
+from blogicum.settings import DATABASES, TEMPLATES
+
+DEBUG = False
+
+TEMPLATES = deepcopy(TEMPLATES)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+WARM_TEMPLATES_ON_STARTUP = True
+
+DATABASES = deepcopy(DATABASES)
+DATABASES['default']['CONN_MAX_AGE'] = 600
+# Ожидание блокировки записи задаётся здесь: модуль sqlite3 выставляет
+# по нему busy_timeout, поэтому в SQLITE_PRAGMAS его нет.
+DATABASES['default']['OPTIONS'] = {'timeout': 5}
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Фоновые задачи выполняет воркер: `python manage.py run_worker`.
+TASKS_EAGER = False
+
+# Письма уходят из воркера через TASKS_EMAIL_BACKEND из основных настроек.
+EMAIL_BACKEND = 'taskqueue.mail.QueuedEmailBackend'
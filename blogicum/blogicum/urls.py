@@ -80,6 +80,7 @@ urlpatterns = [
 
     path('admin/', admin.site.urls),
     path('pages/', include('pages.urls')),
+    path('api/', include('api.urls')),
     path('', include('blog.urls')),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
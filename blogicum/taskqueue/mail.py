@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from taskqueue.tasks import send_email
+
+
+def serialize_message(message):
+    return {
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': message.to,
+        'cc': message.cc,
+        'bcc': message.bcc,
+        'reply_to': message.reply_to,
+        'headers': message.extra_headers,
+        'alternatives': getattr(message, 'alternatives', []),
+    }
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Отправляет письма из фоновой задачи через TASKS_EMAIL_BACKEND.
+
+    Письма с вложениями отправляются сразу: вложения не хранятся в
+    очереди.
+    """
+
+    def send_messages(self, email_messages):
+        direct = [message for message in email_messages
+                  if message.attachments]
+        for message in email_messages:
+            if not message.attachments:
+                send_email.delay(serialize_message(message))
+        if direct:
+            get_connection(settings.TASKS_EMAIL_BACKEND).send_messages(
+                direct)
+        return len(email_messages)
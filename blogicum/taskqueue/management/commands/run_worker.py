@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from taskqueue.queue import run_pending
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в базе данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Пауза в секундах между опросами пустой очереди.',
+        )
+
+    def handle(self, *args, **options):
+        if options['burst']:
+            processed = run_pending()
+            self.stdout.write(f'Выполнено задач: {processed}.')
+            return
+        self.stdout.write('Воркер запущен, для остановки нажмите Ctrl+C.')
+        try:
+            while True:
+                close_old_connections()
+                if not run_pending(limit=100):
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Воркер остановлен.')
@@ -0,0 +1,137 @@
+import logging
+import traceback
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from taskqueue.models import Task
+
+logger = logging.getLogger(__name__)
+
+CLAIM_BATCH_SIZE = 10
+
+registry = {}
+
+
+def task(func=None, *, max_attempts=3):
+    """Регистрирует функцию как фоновую задачу.
+
+    Добавляет ей `delay()` для запуска при первой возможности и
+    `delay_until(run_at)` для запуска не раньше заданного времени.
+
+    Аргументы задачи хранятся в JSON, поэтому в задачу передаются
+    идентификаторы объектов, а не сами объекты.
+    """
+    if func is None:
+        return partial(task, max_attempts=max_attempts)
+    func.task_name = f'{func.__module__}.{func.__name__}'
+    func.max_attempts = max_attempts
+    func.delay = partial(enqueue, func)
+    func.delay_until = partial(enqueue_at, func)
+    registry[func.task_name] = func
+    return func
+
+
+def enqueue(func, *args, **kwargs):
+    """Ставит задачу в очередь или, при TASKS_EAGER, выполняет её сразу.
+
+    Задача создаётся в текущей транзакции и становится видна воркеру
+    только после её фиксации.
+    """
+    return enqueue_at(func, None, *args, **kwargs)
+
+
+def enqueue_at(func, run_at, *args, **kwargs):
+    """Ставит задачу в очередь с запуском не раньше `run_at`.
+
+    Если такая же задача на то же время уже ждёт в очереди, возвращается
+    она. При TASKS_EAGER задача выполняется сразу; отложить её на будущее
+    в этом режиме нельзя — выполнять её некому, поэтому это ошибка.
+    """
+    if settings.TASKS_EAGER:
+        if run_at is not None and run_at > timezone.now():
+            raise ValueError(
+                f'Задачу {func.task_name} нельзя отложить при TASKS_EAGER.')
+        func(*args, **kwargs)
+        return None
+    if run_at is not None:
+        for pending in Task.objects.filter(
+                name=func.task_name, status=Task.PENDING, run_at=run_at):
+            if pending.args == list(args) and pending.kwargs == kwargs:
+                return pending
+    return Task.objects.create(
+        name=func.task_name,
+        args=list(args),
+        kwargs=kwargs,
+        max_attempts=func.max_attempts,
+        run_at=run_at or timezone.now(),
+    )
+
+
+def claim_task():
+    """Захватывает ближайшую готовую задачу.
+
+    Захват — условный UPDATE по прежнему статусу, поэтому несколько
+    воркеров не выполнят одну задачу дважды и без SELECT FOR UPDATE.
+    Задачи, зависшие в статусе «Выполняется» дольше
+    TASKS_RUNNING_TIMEOUT, считаются брошенными и захватываются заново.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.TASKS_RUNNING_TIMEOUT)
+    candidates = Task.objects.filter(
+        Q(status=Task.PENDING, run_at__lte=now)
+        | Q(status=Task.RUNNING, started_at__lt=stale)
+    ).values_list('pk', 'status', 'started_at')[:CLAIM_BATCH_SIZE]
+    for pk, status, started_at in candidates:
+        claimed = Task.objects.filter(
+            pk=pk, status=status, started_at=started_at
+        ).update(
+            status=Task.RUNNING,
+            started_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Task.objects.get(pk=pk)
+    return None
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=settings.TASKS_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def run_task(task):
+    """Выполняет задачу; успешные удаляются, упавшие откладываются."""
+    try:
+        func = registry.get(task.name)
+        if func is None:
+            raise LookupError(f'Задача {task.name} не зарегистрирована.')
+        with transaction.atomic():
+            func(*task.args, **task.kwargs)
+    except Exception:
+        logger.exception('Фоновая задача %s завершилась ошибкой', task)
+        task.last_error = traceback.format_exc()
+        if task.attempts >= task.max_attempts:
+            task.status = Task.FAILED
+        else:
+            task.status = Task.PENDING
+            task.run_at = timezone.now() + retry_delay(task.attempts)
+        task.save(update_fields=('status', 'run_at', 'last_error'))
+        return False
+    task.delete()
+    return True
+
+
+def run_pending(limit=None):
+    """Выполняет готовые задачи, пока они есть; возвращает их количество."""
+    processed = 0
+    while limit is None or processed < limit:
+        task = claim_task()
+        if task is None:
+            break
+        run_task(task)
+        processed += 1
+    return processed
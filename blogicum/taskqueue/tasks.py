@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+from taskqueue.queue import task
+
+
+@task(max_attempts=5)
+def send_email(message):
+    alternatives = message.pop('alternatives')
+    email = EmailMultiAlternatives(
+        connection=get_connection(settings.TASKS_EMAIL_BACKEND), **message)
+    for content, mimetype in alternatives:
+        email.attach_alternative(content, mimetype)
+    email.send()
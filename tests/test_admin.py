@@ -0,0 +1,39 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _changelist_queries(client, query=""):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f"/admin/blog/post/{query}")
+    assert response.status_code == 200
+    return response, len(queries)
+
+
+def test_post_changelist_query_count_is_constant(
+        admin_client, mixer, user, published_category):
+    mixer.cycle(2).blend("blog.Post", author=user, category=published_category)
+    _, few = _changelist_queries(admin_client)
+    mixer.cycle(N_PER_PAGE).blend(
+        "blog.Post", author=mixer.SELECT, category=mixer.SELECT
+    )
+    _, many = _changelist_queries(admin_client)
+    assert many == few, (
+        "Убедитесь, что число запросов списка публикаций в админке "
+        "не зависит от количества строк."
+    )
+
+
+def test_post_changelist_filters_by_author_username(
+        admin_client, post_with_published_location, post_of_another_author):
+    response, _ = _changelist_queries(
+        admin_client,
+        f"?author_username={post_of_another_author.author.username}",
+    )
+    shown = list(response.context["cl"].result_list)
+    assert shown == [post_of_another_author]
+    assert len(shown[0].short_text) <= 31
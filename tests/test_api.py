@@ -0,0 +1,46 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_api_posts_respect_visibility_and_fields(
+        client, post_with_published_location, posts_with_unpublished_category,
+        future_posts):
+    response = client.get("/api/posts/?fields=id,title,location")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"] == [{
+        "id": post_with_published_location.id,
+        "title": post_with_published_location.title,
+        "location": post_with_published_location.location.name,
+    }], (
+        "Убедитесь, что API отдаёт только опубликованные посты и только "
+        "запрошенные поля."
+    )
+    assert client.get("/api/posts/?fields=password").status_code == 400
+
+
+def test_api_posts_batch_and_cursor(
+        client, many_posts_with_published_locations):
+    posts = many_posts_with_published_locations
+    ids = ",".join(str(post.id) for post in posts[:3])
+    data = client.get(f"/api/posts/?ids={ids}&fields=id").json()
+    assert sorted(row["id"] for row in data["results"]) == sorted(
+        post.id for post in posts[:3]
+    )
+    seen = []
+    url = "/api/posts/?fields=id&limit=7"
+    data = client.get(url).json()
+    seen += [row["id"] for row in data["results"]]
+    while data["next"]:
+        data = client.get(f"{url}&cursor={data['next']}").json()
+        seen += [row["id"] for row in data["results"]]
+    assert sorted(seen) == sorted(post.id for post in posts), (
+        "Убедитесь, что курсорная пагинация API обходит все публикации."
+    )
+
+
+def test_api_comments(client, comment_to_a_post):
+    post_id = comment_to_a_post.post.id
+    data = client.get(f"/api/posts/{post_id}/comments/").json()
+    assert [row["id"] for row in data["results"]] == [comment_to_a_post.id]
@@ -0,0 +1,80 @@
+from importlib import reload
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches
+
+import blog.urls
+import blogicum.urls
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def async_views(settings):
+    """Подключает асинхронные представления, как при BLOG_ASYNC_VIEWS=1.
+
+    Выбор представлений делается при импорте blog.urls, поэтому модули
+    маршрутов перезагружаются до и после теста.
+    """
+    enabled = settings.BLOG_ASYNC_VIEWS
+    settings.BLOG_ASYNC_VIEWS = True
+    reload(blog.urls)
+    reload(blogicum.urls)
+    clear_url_caches()
+    yield
+    settings.BLOG_ASYNC_VIEWS = enabled
+    reload(blog.urls)
+    reload(blogicum.urls)
+    clear_url_caches()
+
+
+def get(client, url):
+    async def fetch():
+        return await client.get(url)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = async_to_sync(fetch)()
+    return response, len(queries)
+
+
+@pytest.mark.parametrize("page", ["index", "detail", "category", "profile"])
+def test_async_pages_render(async_views, page, post_with_published_location):
+    post = post_with_published_location
+    url = {
+        "index": "/",
+        "detail": f"/posts/{post.id}/",
+        "category": f"/category/{post.category.slug}/",
+        "profile": f"/profile/{post.author.username}/",
+    }[page]
+    response, _ = get(AsyncClient(), url)
+    assert response.status_code == 200, (
+        f"Убедитесь, что асинхронное представление `{page}` отдаёт "
+        "страницу."
+    )
+    assert post.title in response.content.decode()
+    assert response.resolver_match.func.__module__ == "blog.async_views"
+
+
+def test_async_page_cache_hit_and_miss(
+        async_views, mixer, post_with_published_location):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    client = AsyncClient()
+    _, n_queries = get(client, url)
+    assert n_queries > 0
+    response, n_queries = get(client, url)
+    assert response.status_code == 200 and n_queries == 0, (
+        "Убедитесь, что асинхронная страница для анонимного пользователя "
+        "отдаётся из кэша."
+    )
+    mixer.blend("blog.Comment", post=post, text="Новый комментарий")
+    response, n_queries = get(client, url)
+    assert n_queries > 0, (
+        "Убедитесь, что кэш асинхронной страницы сбрасывается при "
+        "изменении данных."
+    )
+    assert "Новый комментарий" in response.content.decode()
@@ -0,0 +1,182 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import CategoryFeedEntry, Post
+from conftest import N_PER_PAGE
+from taskqueue.models import Task
+from taskqueue.queue import run_pending
+
+pytestmark = [pytest.mark.django_db]
+
+
+def feed_post_ids(category):
+    return set(CategoryFeedEntry.objects.filter(
+        category=category).values_list("post_id", flat=True))
+
+
+@pytest.fixture
+def worker_mode(settings):
+    settings.TASKS_EAGER = False
+
+
+@pytest.fixture
+def visible_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def test_feed_follows_post_changes(visible_post, another_category):
+    assert feed_post_ids(visible_post.category) == {visible_post.id}, (
+        "Убедитесь, что видимая публикация попадает в ленту категории."
+    )
+    visible_post.category = another_category
+    visible_post.save()
+    assert feed_post_ids(another_category) == {visible_post.id}, (
+        "Убедитесь, что при смене категории публикация переезжает в "
+        "ленту новой категории."
+    )
+    visible_post.is_published = False
+    visible_post.save()
+    assert not CategoryFeedEntry.objects.exists(), (
+        "Убедитесь, что снятая с публикации публикация убирается из ленты."
+    )
+    visible_post.is_published = True
+    visible_post.save()
+    visible_post.delete()
+    assert not CategoryFeedEntry.objects.exists()
+
+
+def test_feed_follows_category_status(visible_post):
+    category = visible_post.category
+    category.is_published = False
+    category.save()
+    assert not feed_post_ids(category), (
+        "Убедитесь, что лента снятой с публикации категории очищается."
+    )
+    category.is_published = True
+    category.save()
+    assert feed_post_ids(category) == {visible_post.id}, (
+        "Убедитесь, что при публикации категории её лента заполняется."
+    )
+
+
+def test_scheduled_post_is_promoted(
+        worker_mode, client, mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(hours=1),
+    )
+    assert not CategoryFeedEntry.objects.exists()
+    task = Task.objects.get(name="blog.tasks.promote_scheduled_posts")
+    assert task.run_at == post.pub_date, (
+        "Убедитесь, что для отложенной публикации ставится задача на дату "
+        "её публикации."
+    )
+    url = f"/category/{published_category.slug}/"
+    assert post not in client.get(url).context["page_obj"]
+    # Время публикации наступает без сохранения модели.
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1))
+    Task.objects.update(run_at=timezone.now())
+    run_pending()
+    assert feed_post_ids(published_category) == {post.id}, (
+        "Убедитесь, что наступившая отложенная публикация добавляется в "
+        "ленту категории."
+    )
+    assert post in client.get(url).context["page_obj"], (
+        "Убедитесь, что после добавления в ленту страница категории не "
+        "отдаётся из устаревшего кэша."
+    )
+
+
+def test_sync_command_promotes_and_rebuilds(visible_post):
+    CategoryFeedEntry.objects.all().delete()
+    call_command("sync_category_feeds", stdout=StringIO())
+    assert feed_post_ids(visible_post.category) == {visible_post.id}, (
+        "Убедитесь, что команда `sync_category_feeds` добавляет в ленты "
+        "недостающие видимые публикации."
+    )
+    CategoryFeedEntry.objects.update(pub_date=timezone.now())
+    call_command("sync_category_feeds", rebuild=True, stdout=StringIO())
+    assert CategoryFeedEntry.objects.get().pub_date == visible_post.pub_date
+
+
+@pytest.mark.parametrize("cursor_pagination", [False, True])
+def test_category_page_reads_feed(
+        cursor_pagination, client, mixer, user, published_category):
+    posts = mixer.cycle(N_PER_PAGE + 3).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    expected = sorted(posts, key=lambda post: (post.pub_date, post.id),
+                      reverse=True)
+    url = f"/category/{published_category.slug}/"
+    with override_settings(POSTS_CURSOR_PAGINATION=cursor_pagination):
+        page_obj = client.get(url).context["page_obj"]
+        if cursor_pagination:
+            next_page = f"{url}?cursor={page_obj.next_cursor}"
+        else:
+            next_page = f"{url}?page=2"
+        shown = list(page_obj) + list(
+            client.get(next_page).context["page_obj"])
+    assert shown == expected, (
+        "Убедитесь, что страница категории выводит публикации из ленты "
+        "от новых к старым без пропусков и повторов."
+    )
+
+
+def test_edited_scheduled_post_is_queued_once(
+        worker_mode, mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(hours=1),
+    )
+    post.title = "Исправленный заголовок"
+    post.save()
+    post.save()
+    assert Task.objects.filter(
+        name="blog.tasks.promote_scheduled_posts").count() == 1, (
+        "Убедитесь, что правка отложенной публикации не ставит в очередь "
+        "повторную задачу на то же время."
+    )
+
+
+def test_scheduled_post_is_promoted_in_eager_mode(
+        settings, client, mixer, user, published_category):
+    settings.TASKS_EAGER = True
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(hours=1),
+    )
+    url = f"/category/{published_category.slug}/"
+    assert post not in client.get(url).context["page_obj"]
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1))
+    # Кэш страницы живёт до даты отложенной публикации.
+    cache.clear()
+    assert post in client.get(url).context["page_obj"], (
+        "Убедитесь, что при TASKS_EAGER отложенная публикация появляется "
+        "в ленте категории после наступления её даты."
+    )
+
+
+@pytest.mark.parametrize("eager, replica", [(False, False), (True, True)])
+def test_category_page_does_not_promote(
+        eager, replica, settings, monkeypatch, client, published_category):
+    settings.TASKS_EAGER = eager
+    calls = []
+    monkeypatch.setattr("blog.views.promote_if_due", lambda: calls.append(1))
+    monkeypatch.setattr("blog.views.reads_from_replica", lambda: replica)
+    client.get(f"/category/{published_category.slug}/")
+    assert not calls, (
+        "Убедитесь, что страница категории не пишет в базу, когда ленты "
+        "пополняет воркер или чтение идёт с реплик."
+    )
@@ -0,0 +1,62 @@
+import pytest
+from django.core.management import call_command
+
+from blog.forms import PostForm
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_views(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Текст"})
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что при создании комментария счётчик комментариев "
+        "публикации увеличивается."
+    )
+    comment = post.comments.get()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}")
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что при удалении комментария счётчик комментариев "
+        "публикации уменьшается."
+    )
+
+
+def test_recount_comments_repairs_drift(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+    call_command("recount_comments", "--dry-run")
+    post.refresh_from_db()
+    assert post.comment_count == 42
+    call_command("recount_comments", batch_size=1)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что команда `recount_comments` исправляет расхождения "
+        "в счётчике комментариев."
+    )
+
+
+def test_post_save_keeps_concurrent_comment(
+        user, mixer, post_with_published_location):
+    post = post_with_published_location
+    stale = Post.objects.get(pk=post.pk)
+    mixer.blend("blog.Comment", post=post)
+    form = PostForm(data={
+        "title": "Новый заголовок",
+        "text": stale.text,
+        "pub_date": stale.pub_date,
+        "location": stale.location_id,
+        "category": stale.category_id,
+    }, instance=stale)
+    assert form.is_valid(), form.errors
+    form.save()
+    stale.refresh_from_db()
+    assert stale.title == "Новый заголовок"
+    assert stale.comment_count == 1, (
+        "Убедитесь, что сохранение публикации, загруженной до нового "
+        "комментария, не затирает счётчик комментариев."
+    )
@@ -0,0 +1,106 @@
+import base64
+import json
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import Post
+from blog.paginators import CursorPaginator
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts_with_equal_dates(mixer, user, published_category):
+    pub_date = timezone.now() - timezone.timedelta(days=1)
+    return mixer.cycle(N_PER_PAGE * 2 + 3).blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=pub_date,
+    )
+
+
+def test_cursor_paginator_walks_both_ways(posts_with_equal_dates):
+    expected = list(Post.objects.order_by("-pub_date", "-id"))
+    paginator = CursorPaginator(Post.objects.all(), N_PER_PAGE)
+    pages = [paginator.get_page()]
+    while pages[-1].has_next():
+        pages.append(paginator.get_page(pages[-1].next_cursor))
+    assert [post for page in pages for post in page] == expected, (
+        "Убедитесь, что курсорная пагинация обходит все публикации "
+        "без пропусков и повторов."
+    )
+    previous = paginator.get_page(pages[-1].previous_cursor)
+    assert list(previous) == list(pages[-2])
+    assert previous.has_next() and previous.has_previous()
+    first = paginator.get_page(pages[1].previous_cursor)
+    assert list(first) == list(pages[0]) and not first.has_previous()
+
+
+def test_cursor_paginator_ignores_broken_cursor(posts_with_equal_dates):
+    paginator = CursorPaginator(Post.objects.all(), N_PER_PAGE)
+    assert list(paginator.get_page("not-a-cursor")) == list(
+        paginator.get_page()
+    )
+
+
+@pytest.mark.parametrize("values", [[None, None], [None, 1], [1], []])
+def test_cursor_paginator_ignores_cursor_with_bad_values(
+        posts_with_equal_dates, values):
+    raw = json.dumps({"v": values, "r": False}).encode()
+    cursor = base64.urlsafe_b64encode(raw).decode().rstrip("=")
+    paginator = CursorPaginator(Post.objects.all(), N_PER_PAGE)
+    assert paginator.decode_cursor(cursor) is None, (
+        "Убедитесь, что курсор с пустыми значениями или с неверным их "
+        "числом считается битым."
+    )
+    assert list(paginator.get_page(cursor)) == list(paginator.get_page())
+
+
+@override_settings(POSTS_CURSOR_PAGINATION=True)
+def test_index_uses_cursor_paginator(client, posts_with_equal_dates):
+    response = client.get("/")
+    page_obj = response.context["page_obj"]
+    assert getattr(page_obj, "cursor_based", False)
+    assert len(page_obj) == N_PER_PAGE
+    response = client.get(f"/?cursor={page_obj.next_cursor}")
+    assert response.status_code == 200
+    assert not set(response.context["page_obj"]) & set(page_obj)
+
+
+def test_comments_are_loaded_by_pages(
+        user_client, mixer, post_with_published_location):
+    from blog.utils import COMMENTS_PER_PAGE
+
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTS_PER_PAGE + 5).blend(
+        "blog.Comment", post=post
+    )
+    response = user_client.get(f"/posts/{post.id}/")
+    first_page = response.context["comments"]
+    assert list(first_page) == comments[:COMMENTS_PER_PAGE], (
+        "Убедитесь, что на странице публикации выводится первая страница "
+        "комментариев в порядке их создания."
+    )
+    response = user_client.get(
+        f"/posts/{post.id}/comments/?cursor={first_page.next_cursor}"
+    )
+    assert response.status_code == 200
+    assert list(response.context["comments"]) == comments[COMMENTS_PER_PAGE:]
+    assert "js-load-comments" not in response.content.decode()
+
+
+@override_settings(POSTS_CURSOR_PAGINATION=True)
+def test_pages_survive_null_cursor(
+        client, posts_with_equal_dates, published_category):
+    raw = json.dumps({"v": [None, None], "r": False}).encode()
+    cursor = base64.urlsafe_b64encode(raw).decode().rstrip("=")
+    post_id = posts_with_equal_dates[0].id
+    for url in ("/", f"/category/{published_category.slug}/",
+                f"/posts/{post_id}/", "/api/posts/", "/api/categories/"):
+        response = client.get(url, {"cursor": cursor})
+        assert response.status_code == 200, (
+            f"Убедитесь, что страница `{url}` не падает на курсоре с "
+            "пустыми значениями."
+        )
@@ -0,0 +1,43 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_export_command_writes_jsonl(
+        tmp_path, many_posts_with_published_locations):
+    posts = many_posts_with_published_locations
+    path = tmp_path / "posts.jsonl"
+    call_command("export_data", "posts", output=str(path), chunk_size=3,
+                 stderr=StringIO())
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [row["id"] for row in rows] == sorted(post.id for post in posts), (
+        "Убедитесь, что команда `export_data` выгружает все публикации по "
+        "одной в строке JSONL."
+    )
+    assert rows[0]["title"] == posts[0].title
+
+
+def test_export_command_csv_excludes_secrets(user):
+    output = StringIO()
+    call_command("export_data", "users", format="csv", stdout=output)
+    header, *rows = list(csv.reader(StringIO(output.getvalue())))
+    assert "password" not in header and "email" not in header
+    assert rows == [[str(user.id), user.username, *rows[0][2:]]]
+
+
+def test_export_endpoint_is_staff_only(
+        user_client, admin_client, comment_to_a_post):
+    assert user_client.get("/api/export/comments/").status_code == 302, (
+        "Убедитесь, что выгрузка доступна только сотрудникам."
+    )
+    response = admin_client.get("/api/export/comments/?format=csv")
+    assert response.status_code == 200
+    assert response.streaming
+    content = b"".join(response.streaming_content).decode()
+    assert comment_to_a_post.text in content
+    assert admin_client.get("/api/export/secrets/").status_code == 404
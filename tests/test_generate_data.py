@@ -0,0 +1,47 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, F
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def generate(**options):
+    call_command(
+        "generate_data", users=20, categories=3, locations=5, posts=200,
+        comments=600, future_share=0.2, stdout=StringIO(), **options,
+    )
+
+
+def test_generate_data_scale_and_counts():
+    generate()
+    assert Category.objects.count() == 3
+    assert Location.objects.count() == 5
+    assert Post.objects.count() == 200
+    assert Comment.objects.count() == 600
+    assert Post.objects.filter(pub_date__gt=timezone.now()).exists(), (
+        "Убедитесь, что генератор создаёт отложенные публикации."
+    )
+    assert not Post.objects.annotate(
+        actual=Count("comments")
+    ).exclude(comment_count=F("actual")).exists(), (
+        "Убедитесь, что генератор заполняет счётчик комментариев."
+    )
+    counts = sorted(Post.objects.values_list("comment_count", flat=True))
+    assert counts[0] == 0 and counts[-1] > 10 * counts[len(counts) // 2], (
+        "Убедитесь, что комментарии распределены с длинным хвостом."
+    )
+
+
+def test_generate_data_is_reproducible():
+    generate(seed=7)
+    first = list(Post.objects.order_by("id").values_list(
+        "title", "comment_count"))
+    Post.objects.all().delete()
+    generate(seed=7)
+    assert list(Post.objects.order_by("id").values_list(
+        "title", "comment_count")) == first
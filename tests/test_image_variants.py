@@ -0,0 +1,111 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from blog.forms import PostForm
+from blog.images import IMAGE_VARIANTS
+from taskqueue.queue import run_pending
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_upload(width, height):
+    image_data = BytesIO()
+    Image.new("RGB", (width, height)).save(image_data, "PNG")
+    return SimpleUploadedFile(
+        "variants.png", image_data.getvalue(), content_type="image/png")
+
+
+def submit_post_form(post, image):
+    form = PostForm(
+        data={
+            "title": post.title,
+            "text": post.text,
+            "pub_date": post.pub_date.strftime("%Y-%m-%dT%H:%M"),
+            "category": post.category_id,
+        },
+        files={"image": image},
+        instance=post,
+    )
+    assert form.is_valid(), form.errors
+    post = form.save()
+    run_pending()
+    post.refresh_from_db()
+    return post
+
+
+def test_variants_created_on_upload(user_client, post_with_published_location):
+    post = submit_post_form(post_with_published_location,
+                            make_upload(2000, 1000))
+    post.refresh_from_db()
+    assert set(post.image_variants) == set(IMAGE_VARIANTS), (
+        "Убедитесь, что при загрузке изображения через форму публикации "
+        "создаются все уменьшенные копии."
+    )
+    for variant, width in IMAGE_VARIANTS.items():
+        name = post.image_variants[variant]["name"]
+        with post.image.storage.open(name) as file, Image.open(file) as img:
+            assert img.format == "JPEG"
+            assert img.size == (width, width // 2)
+
+    content = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert f'src="{post.detail_image_url}"' in content
+    assert 'srcset="' in content, (
+        "Убедитесь, что на странице публикации у изображения есть `srcset`."
+    )
+
+
+def test_small_image_is_not_upscaled(post_with_published_location):
+    post = submit_post_form(post_with_published_location,
+                            make_upload(300, 200))
+    post.refresh_from_db()
+    assert list(post.image_variants) == ["card"]
+    assert post.image_variants["card"]["width"] == 300
+
+
+def test_variants_replaced_with_image(post_with_published_location):
+    post = submit_post_form(post_with_published_location,
+                            make_upload(800, 600))
+    old_names = [v["name"] for v in post.image_variants.values()]
+    post = submit_post_form(post, make_upload(700, 500))
+    storage = post.image.storage
+    assert not any(storage.exists(name) for name in old_names), (
+        "Убедитесь, что при замене изображения старые копии удаляются."
+    )
+    assert post.image_variants["card"]["width"] == 640
+
+
+def test_edit_before_worker_keeps_variants(post_with_published_location):
+    post = post_with_published_location
+    form = PostForm(
+        data={
+            "title": post.title,
+            "text": post.text,
+            "pub_date": post.pub_date.strftime("%Y-%m-%dT%H:%M"),
+            "category": post.category_id,
+        },
+        files={"image": make_upload(800, 600)},
+        instance=post,
+    )
+    assert form.is_valid(), form.errors
+    stale = form.save()
+    run_pending()
+    form = PostForm(
+        data={
+            "title": stale.title,
+            "text": "Исправленный текст",
+            "pub_date": stale.pub_date.strftime("%Y-%m-%dT%H:%M"),
+            "category": stale.category_id,
+        },
+        instance=stale,
+    )
+    assert form.is_valid(), form.errors
+    form.save()
+    stale.refresh_from_db()
+    assert stale.text == "Исправленный текст"
+    assert set(stale.image_variants) == {"card"}, (
+        "Убедитесь, что правка публикации, открытой до создания копий "
+        "изображения, не затирает их."
+    )
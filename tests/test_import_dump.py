@@ -0,0 +1,61 @@
+import json
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from blog.dumps import DumpError, JSONArrayReader
+from blog.models import Category, Comment, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+User = get_user_model()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_reader_streams_array_items(chunk_size):
+    data = ' [ {"a": "[,]"} ,\n{"b": [1, 2]}, 345]'
+    items = list(JSONArrayReader(StringIO(data), chunk_size=chunk_size))
+    assert items == [{"a": "[,]"}, {"b": [1, 2]}, 345]
+
+
+@pytest.mark.parametrize("data", ['{"a": 1}', '[{"a": 1}', '[{"a": 1} {}]'])
+def test_reader_rejects_broken_dump(data):
+    with pytest.raises(DumpError):
+        list(JSONArrayReader(StringIO(data), chunk_size=4))
+
+
+def test_import_dump_restores_blog(
+        tmp_path, mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend(Comment, post=post, author=post.author)
+    dump = StringIO()
+    call_command("dumpdata", "auth.user", "blog", stdout=dump)
+    objects = json.loads(dump.getvalue())
+    path = tmp_path / "dump.json"
+    # Обратный порядок: комментарии раньше публикаций и авторов.
+    path.write_text(json.dumps(objects[::-1]), encoding="utf-8")
+    expected = {
+        model: model.objects.count()
+        for model in (User, Category, Location, Post, Comment)
+    }
+    Comment.objects.all().delete()
+    Post.objects.all().delete()
+    Category.objects.all().delete()
+    Location.objects.all().delete()
+    User.objects.all().delete()
+
+    output = StringIO()
+    call_command("import_dump", str(path), batch_size=2, stdout=output)
+
+    assert {
+        model: model.objects.count() for model in expected
+    } == expected, (
+        "Убедитесь, что команда `import_dump` загружает все категории, "
+        "местоположения, пользователей, публикации и комментарии."
+    )
+    restored = Post.objects.get(pk=post.pk)
+    assert restored.title == post.title
+    assert restored.comment_count == 3
+    assert "строк/с" in output.getvalue()
@@ -0,0 +1,44 @@
+import logging
+
+import pytest
+
+from blog.metrics import reset_stats
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    reset_stats()
+    yield
+    reset_stats()
+
+
+def test_metrics_are_grouped_by_view(
+        user_client, admin_client, post_with_published_location):
+    user_client.get("/")
+    user_client.get("/")
+    user_client.get(f"/posts/{post_with_published_location.id}/")
+    assert user_client.get("/api/metrics/").status_code == 302, (
+        "Убедитесь, что статистика запросов доступна только сотрудникам."
+    )
+    stats = admin_client.get("/api/metrics/").json()
+    assert stats["blog:index"]["requests"] == 2, (
+        "Убедитесь, что статистика собирается по имени представления."
+    )
+    assert stats["blog:post_detail"]["requests"] == 1
+    index = stats["blog:index"]
+    assert index["queries"]["mean"] > 0
+    assert index["template_ms"]["max"] > 0
+    assert index["wall_ms"]["max"] >= index["sql_ms"]["max"]
+    assert sum(count for _, count in index["wall_ms"]["buckets"]) == 2
+
+
+def test_slow_requests_are_logged(settings, caplog, user_client):
+    settings.REQUEST_METRICS_SLOW_MS = 0
+    with caplog.at_level(logging.WARNING, logger="blog.metrics"):
+        user_client.get("/")
+    assert "blog:index" in caplog.text, (
+        "Убедитесь, что медленные запросы пишутся в лог."
+    )
+    assert "SELECT" in caplog.text
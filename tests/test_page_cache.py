@@ -0,0 +1,155 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.caching import limit_timeout_by_schedule
+from blog.models import Post
+from taskqueue.queue import run_pending
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _get_with_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return response, len(queries)
+
+
+def test_anonymous_detail_page_is_cached_and_invalidated(
+        client, mixer, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    _get_with_queries(client, url)
+    _, n_queries = _get_with_queries(client, url)
+    assert n_queries == 0, (
+        "Убедитесь, что страница публикации для анонимного пользователя "
+        "отдаётся из кэша."
+    )
+    mixer.blend(
+        "blog.Comment", post=post_with_published_location, text="Новый"
+    )
+    response, n_queries = _get_with_queries(client, url)
+    assert n_queries > 0 and "Новый" in response.content.decode(), (
+        "Убедитесь, что кэш страницы сбрасывается при добавлении комментария."
+    )
+
+
+def test_authenticated_pages_are_not_cached(
+        user_client, post_with_published_location):
+    _get_with_queries(user_client, "/")
+    _, n_queries = _get_with_queries(user_client, "/")
+    assert n_queries > 0
+
+
+def test_timeout_is_limited_by_scheduled_post_of_the_feed(
+        mixer, user, published_category, another_category):
+    category_feed = {"category__slug": published_category.slug}
+    assert limit_timeout_by_schedule(300, {}) == 300
+    mixer.blend(
+        "blog.Post", author=user, category=another_category,
+        pub_date=timezone.now() + timedelta(seconds=30),
+    )
+    assert 1 <= limit_timeout_by_schedule(300, {}) <= 30, (
+        "Убедитесь, что время жизни кэша не превышает время до выхода "
+        "ближайшей отложенной публикации."
+    )
+    assert limit_timeout_by_schedule(300, category_feed) == 300, (
+        "Убедитесь, что отложенные публикации другой категории не "
+        "сокращают время жизни кэша ленты категории."
+    )
+    assert limit_timeout_by_schedule(300, None) == 300
+
+
+def test_post_card_fragment_follows_related_changes(
+        user_client, post_with_published_location, published_category):
+    post = post_with_published_location
+    version = post.card_version
+    user_client.get("/")
+    published_category.title = "Обновлённая категория"
+    published_category.save()
+    run_pending()
+    post.refresh_from_db()
+    assert post.card_version > version, (
+        "Убедитесь, что версия карточки публикации меняется при изменении "
+        "её категории."
+    )
+    assert "Обновлённая категория" in user_client.get("/").content.decode()
+
+
+def test_anonymous_page_shows_related_changes_after_worker(
+        client, post_with_published_location, published_category):
+    client.get("/")
+    published_category.title = "Обновлённая категория"
+    published_category.save()
+    # Страница, запрошенная до выполнения задачи, попадает в кэш со
+    # старыми карточками.
+    client.get("/")
+    run_pending()
+    assert "Обновлённая категория" in client.get("/").content.decode(), (
+        "Убедитесь, что после обновления карточек фоновой задачей кэш "
+        "страниц для анонимных пользователей сбрасывается."
+    )
+
+
+def test_stale_post_save_changes_card_version(
+        mixer, post_with_published_location):
+    post = post_with_published_location
+    stale = Post.objects.get(pk=post.pk)
+    mixer.blend("blog.Comment", post=post)
+    after_comment = Post.objects.get(pk=post.pk).card_version
+    stale.title = "Новый заголовок"
+    stale.save()
+    assert Post.objects.get(pk=post.pk).card_version > after_comment, (
+        "Убедитесь, что сохранение публикации, загруженной до нового "
+        "комментария, всё равно меняет версию карточки."
+    )
+
+
+def _is_cached(client, url):
+    _, n_queries = _get_with_queries(client, url)
+    return n_queries == 0
+
+
+def test_comment_invalidates_only_its_post(
+        client, mixer, user, published_category,
+        post_with_published_location):
+    post = post_with_published_location
+    other = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    urls = ["/", f"/posts/{post.id}/", f"/posts/{other.id}/"]
+    for url in urls:
+        _get_with_queries(client, url)
+    mixer.blend("blog.Comment", post=post)
+    assert not _is_cached(client, urls[1]), (
+        "Убедитесь, что комментарий сбрасывает кэш страницы своей "
+        "публикации."
+    )
+    assert _is_cached(client, urls[0]) and _is_cached(client, urls[2]), (
+        "Убедитесь, что комментарий не сбрасывает кэш ленты и страниц "
+        "других публикаций."
+    )
+
+
+def test_post_edit_invalidates_its_feeds(
+        client, mixer, another_category, post_with_published_location):
+    post = post_with_published_location
+    old_category_url = f"/category/{post.category.slug}/"
+    urls = [
+        "/", f"/posts/{post.id}/", old_category_url,
+        f"/category/{another_category.slug}/",
+        f"/profile/{post.author.username}/",
+    ]
+    for url in urls:
+        _get_with_queries(client, url)
+    post.category = another_category
+    post.save()
+    for url in urls:
+        assert not _is_cached(client, url), (
+            f"Убедитесь, что правка публикации сбрасывает кэш страницы "
+            f"`{url}`, включая страницу прежней категории."
+        )
@@ -0,0 +1,33 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [q["sql"] for q in queries if "COUNT(" in q["sql"]]
+
+
+def test_feed_count_is_cached_and_invalidated(
+        user_client, many_posts_with_published_locations):
+    assert _count_queries(user_client, "/"), (
+        "Первый запрос к ленте должен посчитать публикации."
+    )
+    assert not _count_queries(user_client, "/?page=2"), (
+        "Убедитесь, что количество публикаций в ленте кэшируется."
+    )
+    Post.objects.first().delete()
+    assert _count_queries(user_client, "/"), (
+        "Убедитесь, что кэш количества публикаций сбрасывается "
+        "при удалении публикации."
+    )
+    response = user_client.get("/")
+    assert response.context["page_obj"].paginator.count == (
+        len(many_posts_with_published_locations) - 1
+    )
@@ -0,0 +1,84 @@
+"""Количество SQL-запросов страниц блога не должно зависеть от данных.
+
+Каждая страница открывается дважды: с одним объектом и с полной
+страницей объектов разных авторов и местоположений. Кэш очищается перед
+каждым замером, чтобы в обоих случаях страница строилась с нуля.
+"""
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+N_COMMENTS = 20
+
+
+def count_queries(client, url):
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries)
+
+
+def add_posts(mixer, n, category, locations, author):
+    return mixer.cycle(n).blend(
+        "blog.Post",
+        author=author,
+        category=category,
+        location=mixer.sequence(*locations),
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def assert_constant(counts, url_name):
+    few, many = counts
+    assert few == many, (
+        f"Убедитесь, что число SQL-запросов страницы `{url_name}` не "
+        f"зависит от количества объектов на ней: {few} против {many}."
+    )
+
+
+@pytest.mark.parametrize("url_name", ["index", "category_posts", "profile"])
+def test_feed_query_count_is_constant(
+        url_name, mixer, user, user_client, published_category,
+        published_locations):
+    if url_name == "profile":
+        author = user
+        url = reverse("blog:profile", args=[user.username])
+    else:
+        author = mixer.sequence(
+            *mixer.cycle(N_PER_PAGE).blend("auth.User"))
+        url = {
+            "index": reverse("blog:index"),
+            "category_posts": reverse(
+                "blog:category_posts", args=[published_category.slug]),
+        }[url_name]
+    add_posts(mixer, 1, published_category, published_locations, author)
+    counts = [count_queries(user_client, url)]
+    add_posts(mixer, N_PER_PAGE - 1, published_category,
+              published_locations, author)
+    counts.append(count_queries(user_client, url))
+    assert_constant(counts, url_name)
+
+
+@pytest.mark.parametrize("url_name", ["post_detail", "comments"])
+def test_comments_query_count_is_constant(
+        url_name, mixer, user_client, post_with_published_location):
+    post = post_with_published_location
+    url = reverse(f"blog:{url_name}", args=[post.id])
+    mixer.blend("blog.Comment", post=post)
+    counts = [count_queries(user_client, url)]
+    authors = mixer.cycle(N_COMMENTS - 1).blend("auth.User")
+    mixer.cycle(N_COMMENTS - 1).blend(
+        "blog.Comment", post=post, author=mixer.sequence(*authors))
+    counts.append(count_queries(user_client, url))
+    assert_constant(counts, url_name)
@@ -0,0 +1,47 @@
+import pytest
+from django.test import override_settings
+
+from blog.models import Post
+from blog.routers import ReplicaRouter, replica_reads
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def replica_flags(monkeypatch):
+    flags = []
+    db_for_read = ReplicaRouter.db_for_read
+
+    def spy(self, model, **hints):
+        flags.append(replica_reads.get())
+        return db_for_read(self, model, **hints)
+
+    monkeypatch.setattr(ReplicaRouter, "db_for_read", spy)
+    return flags
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+def test_router_uses_replica_only_inside_read_views():
+    router = ReplicaRouter()
+    assert router.db_for_read(Post) is None
+    token = replica_reads.set(True)
+    try:
+        assert router.db_for_read(Post) == "replica"
+    finally:
+        replica_reads.reset(token)
+    assert router.db_for_write(Post) == "default"
+
+
+def test_writes_pin_client_to_primary(
+        user_client, post_with_published_location, replica_flags):
+    post = post_with_published_location
+    user_client.get(f"/posts/{post.id}/")
+    assert replica_flags and all(replica_flags), (
+        "Убедитесь, что страница публикации читает данные с реплик."
+    )
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Текст"})
+    replica_flags.clear()
+    user_client.get(f"/posts/{post.id}/")
+    assert replica_flags and not any(replica_flags), (
+        "Убедитесь, что после записи клиент читает с основной базы."
+    )
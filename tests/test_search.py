@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _found_ids(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_search_finds_only_visible_posts(
+        client, mixer, user, published_category, posts_with_unpublished_category):
+    matching = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Прогулка по набережной", text="Текст",
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Другое", text="Совсем другое",
+    )
+    hidden = posts_with_unpublished_category[0]
+    hidden.title = "Набережная"
+    hidden.save()
+    assert _found_ids(client, "набережн") == [matching.id], (
+        "Убедитесь, что поиск находит опубликованные посты по началу слова "
+        "и не показывает скрытые публикации."
+    )
+    assert _found_ids(client, '"; DROP') == []
+
+
+def test_search_index_follows_updates_and_deletes(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    post.text = "Уникальное слово ксилофон"
+    post.save()
+    assert _found_ids(user_client, "ксилофон") == [post.id], (
+        "Убедитесь, что поисковый индекс обновляется при изменении поста."
+    )
+    Post.objects.filter(pk=post.pk).delete()
+    assert _found_ids(user_client, "ксилофон") == []
+
+
+@override_settings(POSTS_CURSOR_PAGINATION=True)
+def test_search_keeps_relevance_order_with_cursor_pagination(
+        client, mixer, user, published_category):
+    now = timezone.now()
+    relevant = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Маяк", text="Маяк на берегу, маяк светит",
+        pub_date=now - timedelta(days=10),
+    )
+    recent = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Заметка", text="Между делом упомянут маяк",
+        pub_date=now - timedelta(days=1),
+    )
+    assert _found_ids(client, "маяк") == [relevant.id, recent.id], (
+        "Убедитесь, что при курсорной пагинации результаты поиска "
+        "остаются отсортированными по релевантности, а не по дате."
+    )
@@ -0,0 +1,42 @@
+import pytest
+from django.db import connections
+
+from blogicum import settings_production
+
+pytestmark = [pytest.mark.django_db]
+
+# Значения, которые SQLite возвращает для символьных настроек.
+SYMBOLIC = {
+    "journal_mode": {"WAL": "wal"},
+    "synchronous": {"OFF": 0, "NORMAL": 1, "FULL": 2},
+    "temp_store": {"DEFAULT": 0, "FILE": 1, "MEMORY": 2},
+}
+
+
+def test_production_pragmas_are_applied(settings, tmp_path):
+    settings.SQLITE_PRAGMAS = settings_production.SQLITE_PRAGMAS
+    options = settings_production.DATABASES["default"]["OPTIONS"]
+    default = connections["default"]
+    wrapper = default.__class__({
+        **default.settings_dict,
+        "NAME": str(tmp_path / "db.sqlite3"),
+        "OPTIONS": options,
+    })
+    try:
+        with wrapper.cursor() as cursor:
+            actual = {}
+            for name in [*settings.SQLITE_PRAGMAS, "busy_timeout"]:
+                cursor.execute(f"PRAGMA {name}")
+                actual[name] = cursor.fetchone()[0]
+    finally:
+        wrapper.close()
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        expected = SYMBOLIC.get(name, {}).get(value, value)
+        assert actual[name] == expected, (
+            f"Убедитесь, что при подключении к SQLite выполняется "
+            f"`PRAGMA {name} = {value}`."
+        )
+    assert actual["busy_timeout"] == options["timeout"] * 1000, (
+        "Убедитесь, что время ожидания блокировки SQLite берётся из "
+        "DATABASES['default']['OPTIONS']['timeout']."
+    )
@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+from taskqueue.models import Task
+from taskqueue.queue import run_pending, task
+
+pytestmark = [pytest.mark.django_db]
+
+calls = []
+
+
+@task(max_attempts=2)
+def flaky(value):
+    calls.append(value)
+    raise ValueError("Ошибка задачи")
+
+
+@task
+def record(value):
+    calls.append(value)
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+@pytest.fixture(autouse=True)
+def worker_mode(settings):
+    # В основных настройках задачи выполняются сразу; здесь проверяется
+    # очередь, как в боевых настройках с воркером.
+    settings.TASKS_EAGER = False
+
+
+def test_task_runs_in_worker_and_is_removed():
+    record.delay("готово")
+    assert calls == [], (
+        "Убедитесь, что `delay()` не выполняет задачу сразу, а ставит её "
+        "в очередь."
+    )
+    assert run_pending() == 1
+    assert calls == ["готово"]
+    assert not Task.objects.exists(), (
+        "Убедитесь, что выполненные задачи удаляются из очереди."
+    )
+
+
+def test_failed_task_is_retried_with_delay():
+    flaky.delay(1)
+    run_pending()
+    queued = Task.objects.get()
+    assert queued.status == Task.PENDING
+    assert queued.attempts == 1
+    assert queued.run_at > timezone.now(), (
+        "Убедитесь, что повторная попытка откладывается."
+    )
+    assert "ValueError" in queued.last_error
+    assert run_pending() == 0
+
+    Task.objects.update(run_at=timezone.now())
+    run_pending()
+    queued.refresh_from_db()
+    assert queued.status == Task.FAILED, (
+        "Убедитесь, что после исчерпания попыток задача помечается "
+        "ошибочной."
+    )
+    assert calls == [1, 1]
+
+
+def test_stale_running_task_is_reclaimed(settings):
+    queued = record.delay("снова")
+    Task.objects.filter(pk=queued.pk).update(
+        status=Task.RUNNING,
+        started_at=timezone.now() - timedelta(
+            seconds=settings.TASKS_RUNNING_TIMEOUT + 1),
+    )
+    assert run_pending() == 1
+    assert calls == ["снова"]
+
+
+def test_eager_mode_runs_inline(settings):
+    settings.TASKS_EAGER = True
+    assert record.delay("сразу") is None
+    assert calls == ["сразу"]
+    assert not Task.objects.exists()
+
+
+def test_queued_email_backend(settings):
+    settings.EMAIL_BACKEND = "taskqueue.mail.QueuedEmailBackend"
+    settings.TASKS_EMAIL_BACKEND = (
+        "django.core.mail.backends.locmem.EmailBackend")
+    mail.send_mail("Тема", "Текст", "from@example.com", ["to@example.com"])
+    assert mail.outbox == [], (
+        "Убедитесь, что письма отправляются из фоновой задачи."
+    )
+    run_pending()
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].subject == "Тема"
+
+
+def test_category_change_fans_out_in_worker(
+        post_with_published_location, published_category):
+    post = post_with_published_location
+    version = post.card_version
+    published_category.save()
+    post.refresh_from_db()
+    assert post.card_version == version
+    run_pending()
+    post.refresh_from_db()
+    assert post.card_version > version, (
+        "Убедитесь, что версии карточек публикаций категории обновляет "
+        "фоновая задача."
+    )
+
+
+def test_delay_until_waits_for_run_at():
+    record.delay_until(timezone.now() + timedelta(hours=1), "позже")
+    assert run_pending() == 0, (
+        "Убедитесь, что задача из `delay_until()` не выполняется раньше "
+        "заданного времени."
+    )
+    Task.objects.update(run_at=timezone.now())
+    assert run_pending() == 1
+    assert calls == ["позже"]
+
+
+def test_delay_until_refuses_future_run_in_eager_mode(settings):
+    settings.TASKS_EAGER = True
+    with pytest.raises(ValueError):
+        record.delay_until(timezone.now() + timedelta(hours=1), "позже")
+    assert calls == []
@@ -0,0 +1,37 @@
+from copy import deepcopy
+from io import StringIO
+
+import pytest
+from django.core.management import call_command, CommandError
+
+
+@pytest.fixture
+def templates_dir(settings, tmp_path):
+    (tmp_path / "ok.html").write_text("{{ value }}")
+    (tmp_path / "broken.html").write_text("{% if value %}")
+    (tmp_path / "later.html").write_text("{% block content %}{% endblock %}")
+    templates = deepcopy(settings.TEMPLATES)
+    templates[0]["DIRS"] = [tmp_path]
+    settings.TEMPLATES = templates
+    return tmp_path
+
+
+def test_warm_templates_reports_every_broken_template(templates_dir):
+    stdout, stderr = StringIO(), StringIO()
+    with pytest.raises(CommandError):
+        call_command("warm_templates", stdout=stdout, stderr=stderr)
+    assert "broken.html" in stderr.getvalue(), (
+        "Убедитесь, что команда `warm_templates` сообщает о шаблоне, "
+        "который не компилируется."
+    )
+    assert "later.html" in stdout.getvalue(), (
+        "Убедитесь, что ошибка в одном шаблоне не прерывает компиляцию "
+        "остальных."
+    )
+    assert "ok.html" in stdout.getvalue()
+
+
+def test_warm_templates_succeeds_on_project_templates():
+    stdout = StringIO()
+    call_command("warm_templates", stdout=stdout)
+    assert "blog/index.html" in stdout.getvalue()